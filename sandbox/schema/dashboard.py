@@ -1,17 +1,23 @@
 import strawberry
 from strawberry.schema.config import StrawberryConfig
 from catalogue.dashboard import CatalogueQuery
+from products.dashboard import ProductsQuery
 from strawberry_django.optimizer import DjangoOptimizerExtension
+from utils.persisted_queries import PersistedQueries
+from utils.query_cost import QueryCost
+from utils.tracing import OperationTracing
 
 
 @strawberry.type
-class Query(CatalogueQuery):
+class Query(CatalogueQuery, ProductsQuery):
     node: strawberry.relay.Node = strawberry.relay.node()
-    nodes: list[strawberry.relay.Node] = strawberry.relay.node()
+    # IDs are grouped by type and each type is fetched with one optimized `pk__in` query,
+    #  deleted objects come back as null instead of failing the whole list.
+    nodes: list[strawberry.relay.Node | None] = strawberry.relay.node()
 
 
 schema = strawberry.Schema(
     query=Query,
     config=StrawberryConfig(relay_max_results=10),
-    extensions=[DjangoOptimizerExtension],
+    extensions=[OperationTracing, PersistedQueries, QueryCost, DjangoOptimizerExtension],
 )
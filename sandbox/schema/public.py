@@ -1,9 +1,27 @@
 import strawberry
+from strawberry.schema.config import StrawberryConfig
+from catalogue.public import CatalogueQuery
+from products.public import ProductsQuery
+from strawberry_django.optimizer import DjangoOptimizerExtension
+from utils.persisted_queries import PersistedQueries
+from utils.query_cost import QueryCost
+from utils.response_cache import ResponseCache
+from utils.tracing import OperationTracing
 
 
 @strawberry.type
-class Query:
-    test: str = strawberry.field(lambda: "Hello, world!")
+class Query(CatalogueQuery, ProductsQuery):
+    pass
 
 
-schema = strawberry.Schema(query=Query)
+schema = strawberry.Schema(
+    query=Query,
+    config=StrawberryConfig(relay_max_results=20),
+    extensions=[
+        OperationTracing,
+        PersistedQueries,
+        QueryCost,
+        ResponseCache,
+        DjangoOptimizerExtension,
+    ],
+)
@@ -222,6 +222,14 @@ LOGGING = {
             "delay": False,
         },
     },
+    "loggers": {
+        # results of `RUN_BENCHMARKS=1 python sandbox/manage.py test tests.benchmarks`
+        "tests.benchmarks": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
 }
 
 if env("LOGGING_QUERIES", default=False):
@@ -256,6 +264,11 @@ DEBUG_TOOLBAR_CONFIG = {
 }
 
 
+# Operations estimated above this cost are rejected before execution (utils.query_cost)
+GRAPHQL_MAX_QUERY_COST = env.int("GRAPHQL_MAX_QUERY_COST", default=5000)
+# Seconds an anonymous query result stays in the response cache (utils.response_cache)
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = env.int("GRAPHQL_RESPONSE_CACHE_TIMEOUT", default=300)
+
 STRAWBERRY_DJANGO = {
     "FIELD_DESCRIPTION_FROM_HELP_TEXT": True,
     "TYPE_DESCRIPTION_FROM_MODEL_DOCSTRING": True,
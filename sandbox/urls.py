@@ -1,14 +1,16 @@
 from django.urls import path, include
 from django.contrib import admin
 from django.conf import settings
-from strawberry.django.views import AsyncGraphQLView
+from utils.tracing import graphql_metrics
+from utils.views import GraphQLView
 from .schema import public_schema, dashboard_schema
 
 
 urlpatterns = [
+    path("admin/graphql-metrics/", graphql_metrics, name="graphql-metrics"),
     path("admin/", admin.site.urls),
-    path("graphql/", AsyncGraphQLView.as_view(schema=public_schema)),
-    path("dashboard/graphql/", AsyncGraphQLView.as_view(schema=dashboard_schema)),
+    path("graphql/", GraphQLView.as_view(schema=public_schema)),
+    path("dashboard/graphql/", GraphQLView.as_view(schema=dashboard_schema)),
 ]
 
 
@@ -0,0 +1,188 @@
+import csv
+import json
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.text import slugify
+from utils.response_cache import invalidate_tags, model_tag
+
+from .models import Category, CategoryProductCount, CategoryTranslation
+from .tree import invalidate_category_tree
+
+CATEGORY_FIELDS = (
+    "name", "slug", "description", "meta_title", "meta_description", "is_public", "background_caption",
+)
+TRANSLATION_FIELDS = ("name", "description", "meta_title", "meta_description")
+
+
+def _next_position(parent):
+    last = Category.get_last_root_node() if parent is None else parent.get_last_child()
+    return last._get_lastpos_in_path() + 1 if last else 1
+
+
+@transaction.atomic
+def import_categories(nodes, parent=None, batch_size=1000) -> list[Category]:
+    """
+        create a nested tree of categories under `parent` (or as new roots).
+
+        each node is a dict of CATEGORY_FIELDS with optional
+         `translations` ({language_code: {field: value}}) and `children` (more nodes).
+
+        - paths, numchild, full_name/full_slug and ancestors_are_public are computed in memory,
+         then categories and translations are written with `bulk_create`
+         instead of one treebeard insert per node.
+    """
+    categories, translations = [], []
+
+    def build(nodes, parent, position):
+        for offset, node in enumerate(nodes):
+            children = node.get("children") or ()
+            category = Category(
+                **{field: node[field] for field in CATEGORY_FIELDS if node.get(field) is not None}
+            )
+            category.slug = category.slug or slugify(category.name, allow_unicode=True)
+            category.depth = 1 if parent is None else parent.depth + 1
+            category.path = Category._get_path(
+                parent.path if parent else None, category.depth, position + offset
+            )
+            category.numchild = len(children)
+            if parent is None:
+                category.full_name, category.full_slug = category.name, category.slug
+            else:
+                category.full_name = parent.full_name + Category._full_name_seperator + category.name
+                category.full_slug = parent.full_slug + Category._full_slug_seperator + category.slug
+                category.ancestors_are_public = parent.is_public and parent.ancestors_are_public
+            categories.append(category)
+            translations.extend(
+                (category, language_code, values)
+                for language_code, values in (node.get("translations") or {}).items()
+            )
+            build(children, category, 1)
+
+    if parent is not None:
+        # paths, names and visibility of the new nodes derive from the stored parent
+        parent.refresh_from_db()
+    build(nodes, parent, _next_position(parent))
+
+    Category.objects.bulk_create(categories, batch_size=batch_size)
+    CategoryProductCount.objects.bulk_create(
+        (CategoryProductCount(category=category) for category in categories), batch_size=batch_size
+    )
+    CategoryTranslation.objects.bulk_create(
+        (
+            CategoryTranslation(
+                category=category,
+                language_code=language_code,
+                **{field: values[field] for field in TRANSLATION_FIELDS if field in values},
+            )
+            for category, language_code, values in translations
+        ),
+        batch_size=batch_size,
+    )
+    if parent is not None and nodes:
+        Category.objects.filter(pk=parent.pk).update(numchild=F("numchild") + len(nodes))
+        parent.refresh_from_db(fields=["numchild"])
+    invalidate_category_tree()
+    invalidate_tags(model_tag(Category))
+    return categories
+
+
+def iter_categories(root=None, chunk_size=2000):
+    """Yields `(category, {language_code: {field: value}})` of the tree (or `root` subtree) in path order."""
+    queryset = Category.get_tree(root).prefetch_related("translations")
+    for category in queryset.iterator(chunk_size=chunk_size):
+        yield category, {
+            translation.language_code: {
+                field: getattr(translation, field)
+                for field in TRANSLATION_FIELDS
+                if getattr(translation, field) not in (None, "")
+            }
+            for translation in category.translations.all()
+        }
+
+
+def _open_json_node(category, translations, encode) -> str:
+    """The node up to its `children` list, which the following nodes of the subtree fill."""
+    node = {field: getattr(category, field) for field in CATEGORY_FIELDS}
+    if translations:
+        node["translations"] = translations
+    members = ", ".join(f"{encode(key)}: {encode(value)}" for key, value in node.items())
+    return "{" + members + ', "children": ['
+
+
+def export_json(root=None):
+    """
+        streams the tree as nested JSON accepted by `import_categories`,
+         one node at a time so the whole tree is never held in memory.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    depth = base = None
+    yield "["
+    for category, translations in iter_categories(root):
+        if depth is None:
+            base = category.depth
+        elif category.depth <= depth:
+            # close the previous node and its ancestors up to the level of this one
+            yield "]}" * (depth - category.depth + 1) + ", "
+        depth = category.depth
+        yield _open_json_node(category, translations, encode)
+    if depth is not None:
+        yield "]}" * (depth - base + 1)
+    yield "]"
+
+
+def export_csv(root=None, languages=()):
+    """
+        streams the tree as CSV rows, parents before children.
+
+        translated fields go to `<field>[<language_code>]` columns of the given languages.
+    """
+    class Echo:
+        def write(self, value):
+            return value
+
+    header = [
+        "parent", *CATEGORY_FIELDS,
+        *(f"{field}[{language}]" for language in languages for field in TRANSLATION_FIELDS),
+    ]
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+
+    slugs = {}
+    for category, translations in iter_categories(root):
+        slugs[category.path] = category.slug
+        yield writer.writerow([
+            slugs.get(category.path[: -Category.steplen], "") if category.depth > 1 else "",
+            *(getattr(category, field) for field in CATEGORY_FIELDS),
+            *(
+                translations.get(language, {}).get(field, "")
+                for language in languages
+                for field in TRANSLATION_FIELDS
+            ),
+        ])
+
+
+def read_csv(lines) -> list[dict]:
+    """Turns rows written by `export_csv` back into nested nodes for `import_categories`."""
+    roots, nodes = [], {}
+    for row in csv.DictReader(lines):
+        node = {"children": [], "translations": {}}
+        for column, value in row.items():
+            if column == "parent" or value == "":
+                continue
+            if column.endswith("]"):
+                field, language = column[:-1].split("[")
+                node["translations"].setdefault(language, {})[field] = value
+            elif column == "is_public":
+                node[column] = value.lower() in ("1", "true", "yes")
+            else:
+                node[column] = value
+        node.setdefault("slug", slugify(node.get("name", ""), allow_unicode=True))
+        nodes[node["slug"]] = node
+        if not row.get("parent"):
+            roots.append(node)
+        elif row["parent"] in nodes:
+            nodes[row["parent"]]["children"].append(node)
+        else:
+            raise ValueError("Parent %r of %r must come before it." % (row["parent"], node["slug"]))
+    return roots
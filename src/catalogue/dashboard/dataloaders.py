@@ -0,0 +1,42 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+
+from .. import models
+
+
+def _children(paths):
+    steplen = models.Category.steplen
+    condition = Q()
+    for path in paths:
+        condition |= Q(path__startswith=path, depth=len(path) // steplen + 1)
+
+    children = {path: [] for path in paths}
+    for category in models.Category.objects.filter(condition).order_by("path"):
+        children[category.path[:-steplen]].append(category)
+    return [children[path] for path in paths]
+
+
+def _ancestors(paths):
+    steplen = models.Category.steplen
+    ancestor_paths = {
+        path: [path[:end] for end in range(steplen, len(path), steplen)]
+        for path in paths
+    }
+    categories = models.Category.objects.in_bulk(
+        {ancestor for ancestors in ancestor_paths.values() for ancestor in ancestors},
+        field_name="path",
+    )
+    return [
+        [categories[ancestor] for ancestor in ancestor_paths[path] if ancestor in categories]
+        for path in paths
+    ]
+
+
+async def load_children(paths: list[str]) -> list[list[models.Category]]:
+    """Direct children of every requested node, with one path-prefix query."""
+    return await sync_to_async(_children)(paths)
+
+
+async def load_ancestors(paths: list[str]) -> list[list[models.Category]]:
+    """Ancestors of every requested node (root first), with one query over their parent paths."""
+    return await sync_to_async(_ancestors)(paths)
@@ -1,12 +1,17 @@
 from typing import TYPE_CHECKING, Annotated, Optional, Self
 
 import strawberry_django
-from asgiref.sync import sync_to_async
 from strawberry import UNSET, auto, lazy, relay
 from strawberry.relay import GlobalID
 from strawberry.types import Info
 from strawberry_django import BaseFilterLookup
 
+from utils.dataloaders import get_dataloader
+from utils.translations import (
+    prefetch_translations,
+    resolve_translation,
+    resolve_translations,
+)
 from utils.types import (
     BaseSeoModelType,
     ModelWithDescriptionType,
@@ -14,16 +19,12 @@ from utils.types import (
 )
 
 from .. import models
+from .dataloaders import load_ancestors, load_children
 
 if TYPE_CHECKING:
     from products.dashboard.types import ProductType
 
 
-async def resolve_tree(instance, method_name: str):
-    method = getattr(instance, method_name)
-    return await sync_to_async(lambda: list(method()))()
-
-
 @strawberry_django.filter_type(models.Category, lookups=True)
 class CategoryFilterType:
     id: Optional[BaseFilterLookup[GlobalID]] = UNSET
@@ -57,6 +58,8 @@ class CategoryTranslationType(relay.Node, TranslationModelType):
 class CategoryType(relay.Node, BaseSeoModelType, ModelWithDescriptionType):
     name: auto
     slug: auto
+    full_name: auto
+    full_slug: auto
     updated_at: auto
     is_public: auto
     ancestors_are_public: auto
@@ -64,18 +67,37 @@ class CategoryType(relay.Node, BaseSeoModelType, ModelWithDescriptionType):
     background_caption: auto
     numchild: auto
     products: list[Annotated["ProductType", lazy("products.dashboard.types")]]
-    translations: list[CategoryTranslationType]
+
+    @strawberry_django.field(
+        description="Translations of this node, only the requested language when one is asked",
+        prefetch_related=[prefetch_translations(models.CategoryTranslation)],
+    )
+    def translations(
+        self, info: Info, language: str | None = None
+    ) -> list[CategoryTranslationType]:
+        return resolve_translations(self, info, language)
+
+    @strawberry_django.field(
+        description="Translation in the requested language, falling back to the default one",
+        prefetch_related=[
+            prefetch_translations(models.CategoryTranslation, to_attr="fallback_translations")
+        ],
+    )
+    def translation(
+        self, info: Info, language: str | None = None
+    ) -> CategoryTranslationType | None:
+        return resolve_translation(self, info, language, to_attr="fallback_translations")
 
     @strawberry_django.field(
         description="all direct children of this node",
         only=["path", "depth", "numchild"],
     )
-    async def children(self, info: Info) -> list[Self]:  # FIXME n+1 query problem :(
-        return await resolve_tree(self, "get_children")
+    async def children(self, info: Info) -> list[Self]:
+        return await get_dataloader(info, load_children).load(self.path)
 
     @strawberry_django.field(
         description="Ancestors of this node",
         only=["path", "depth", "numchild"],
     )
-    async def ancestors(self, info: Info) -> list[Self]:  # FIXME n+1 query problem :(
-        return await resolve_tree(self, "get_ancestors")
+    async def ancestors(self, info: Info) -> list[Self]:
+        return await get_dataloader(info, load_ancestors).load(self.path)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalogue.bulk import export_csv, export_json
+from catalogue.models import Category
+from utils.languages import Language
+
+
+class Command(BaseCommand):
+    help = "Stream the category tree (with translations) as nested JSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=("json", "csv"), default="json")
+        parser.add_argument("--root", help="Slug of the category to export with its subtree.")
+        parser.add_argument("--output", "-o", help="File to write, stdout by default.")
+
+    def handle(self, *args, **options):
+        root = None
+        if options["root"]:
+            try:
+                root = Category.objects.get(slug=options["root"])
+            except Category.DoesNotExist:
+                raise CommandError("Category %r does not exist." % options["root"])
+
+        if options["format"] == "csv":
+            chunks = export_csv(root, languages=Language.values)
+        else:
+            chunks = export_json(root)
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            output.writelines(chunks)
@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalogue.bulk import import_categories, read_csv
+from catalogue.models import Category
+
+
+class Command(BaseCommand):
+    help = "Import a nested category tree (with translations) from a JSON or CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("json", "csv"))
+        parser.add_argument("--parent", help="Slug of the category that receives the tree.")
+
+    def handle(self, *args, path, **options):
+        file_format = options["format"] or ("csv" if path.endswith(".csv") else "json")
+        parent = None
+        if options["parent"]:
+            try:
+                parent = Category.objects.get(slug=options["parent"])
+            except Category.DoesNotExist:
+                raise CommandError("Category %r does not exist." % options["parent"])
+
+        with open(path, encoding="utf-8", newline="") as file:
+            try:
+                nodes = read_csv(file) if file_format == "csv" else json.load(file)
+            except ValueError as error:
+                raise CommandError(error)
+
+        categories = import_categories(nodes, parent=parent)
+        self.stdout.write("%d categories imported." % len(categories))
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.7 on 2026-10-18 21:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_full_names(apps, schema_editor):
+    Category = apps.get_model("catalogue", "Category")
+    names = {}
+    categories = list(Category.objects.order_by("path"))
+    for category in categories:
+        parent = names.get(category.path[:-4])
+        if parent is None:
+            category.full_name, category.full_slug = category.name, category.slug
+        else:
+            category.full_name = parent[0] + " > " + category.name
+            category.full_slug = parent[1] + "/" + category.slug
+        names[category.path] = (category.full_name, category.full_slug)
+    Category.objects.bulk_update(categories, ["full_name", "full_slug"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0001_initial'),
+        ('products', '0009_productclasseffectiveattribute'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='full_name',
+            field=models.CharField(default='', editable=False, max_length=1024),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='full_slug',
+            field=models.CharField(default='', editable=False, max_length=1024),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_full_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='category',
+            name='full_slug',
+            field=models.CharField(editable=False, max_length=1024, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='productcategory',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product', to='catalogue.category'),
+        ),
+        migrations.AlterField(
+            model_name='productcategory',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category', to='products.product'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.7 on 2026-10-18 21:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_product_counts(apps, schema_editor):
+    Category = apps.get_model("catalogue", "Category")
+    ProductCategory = apps.get_model("catalogue", "ProductCategory")
+    CategoryProductCount = apps.get_model("catalogue", "CategoryProductCount")
+
+    paths = dict(Category.objects.values_list("pk", "path"))
+    pk_by_path = {path: pk for pk, path in paths.items()}
+    direct, subtree = {}, {}
+    for category_id, product_id in ProductCategory.objects.filter(
+        product__is_public=True
+    ).values_list("category_id", "product_id"):
+        direct[category_id] = direct.get(category_id, 0) + 1
+        path = paths[category_id]
+        for end in range(4, len(path) + 1, 4):
+            subtree.setdefault(pk_by_path[path[:end]], set()).add(product_id)
+
+    CategoryProductCount.objects.bulk_create(
+        (
+            CategoryProductCount(
+                category_id=pk,
+                direct_count=direct.get(pk, 0),
+                subtree_count=len(subtree.get(pk, ())),
+            )
+            for pk in paths
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0002_category_full_name_category_full_slug_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryProductCount',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='product_count', serialize=False, to='catalogue.category')),
+                ('direct_count', models.PositiveIntegerField(default=0)),
+                ('subtree_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_product_counts, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models.functions import Coalesce, Concat, Substr
 from django.utils.text import slugify
 from utils.models import BaseSeoModel, ModelWithDescription, TranslationModel
 from treebeard.mp_tree import MP_Node, MP_NodeManager
+from utils.response_cache import invalidate_tags, model_tag
+
+from .tree import invalidate_category_tree
 
 
 class ReverseStartsWithLookup(models.lookups.StartsWith):
@@ -34,6 +38,60 @@ class CategoryQuerySet(MP_NodeManager):
     def browsable(self):
         return self.filter(is_public=True, ancestors_are_public=True)
 
+    def refresh_ancestors_are_public(self, nodes):
+        """
+            set correct value for (ancestors_are_public) field in the subtrees of `nodes`.
+
+            - hidden prefixes (paths of non-public nodes) are collected with one query,
+             then rows are updated with indexed (path LIKE 'prefix%') matches
+             instead of a correlated subquery per row.
+            - only rows whose value actually changes are written.
+        """
+        steplen = self.model.steplen
+        roots = []
+        for path in sorted({node.path for node in nodes}):
+            if not roots or not path.startswith(roots[-1]):
+                roots.append(path)
+        if not roots:
+            return 0
+
+        in_subtrees = models.Q()
+        for path in roots:
+            in_subtrees |= models.Q(path__startswith=path)
+        ancestor_paths = {
+            path[:end] for path in roots for end in range(steplen, len(path), steplen)
+        }
+        hidden_paths = self.filter(
+            models.Q(path__in=ancestor_paths) | in_subtrees, is_public=False
+        ).order_by("path").values_list("path", flat=True)
+
+        hidden = models.Q()
+        hidden_prefixes = []
+        for path in hidden_paths:
+            if hidden_prefixes and path.startswith(hidden_prefixes[-1]):
+                continue
+            hidden_prefixes.append(path)
+            hidden |= models.Q(path__startswith=path, depth__gt=len(path) // steplen)
+
+        subtrees = self.filter(in_subtrees)
+        updated = 0
+        if hidden_prefixes:
+            updated += subtrees.filter(hidden, ancestors_are_public=True).update(
+                ancestors_are_public=False
+            )
+        updated += subtrees.exclude(hidden).filter(ancestors_are_public=False).update(
+            ancestors_are_public=True
+        )
+        invalidate_category_tree()
+        invalidate_tags(model_tag(self.model))
+        return updated
+
+    def set_public(self, nodes, is_public: bool):
+        """Toggle (is_public) of many nodes at once and propagate it to their subtrees."""
+        nodes = list(nodes)
+        self.filter(pk__in=[node.pk for node in nodes]).update(is_public=is_public)
+        return self.refresh_ancestors_are_public(nodes)
+
 
 
 class Category(MP_Node, BaseSeoModel, ModelWithDescription):
@@ -46,6 +104,9 @@ class Category(MP_Node, BaseSeoModel, ModelWithDescription):
     is_public = models.BooleanField(default=True)
     ancestors_are_public = models.BooleanField(default=True)
 
+    full_name = models.CharField(max_length=1024, editable=False)
+    full_slug = models.CharField(max_length=1024, unique=True, editable=False)
+
     objects = CategoryQuerySet()
 
     class Meta:
@@ -67,25 +128,78 @@ class Category(MP_Node, BaseSeoModel, ModelWithDescription):
         return "<%s obj> %s" % (type(self).__name__, self.name)
 
     _full_name_seperator = " > "
+    _full_slug_seperator = "/"
+
+    def _build_full_names(self) -> tuple[str, str]:
+        parent = self.get_parent(update=True)
+        if parent is None:
+            return self.name, self.slug
+        return (
+            parent.full_name + self._full_name_seperator + self.name,
+            parent.full_slug + self._full_slug_seperator + self.slug,
+        )
 
-    @property
-    def full_name(self) -> str:
-        names = [category.name for category in self.get_ancestors()]
-        names.append(self.name)
-        return self._full_name_seperator.join(names)
+    def _stored_full_names(self) -> tuple[str, str]:
+        return type(self)._default_manager.filter(pk=self.pk).values_list(
+            "full_name", "full_slug"
+        ).get()
 
-    _full_slug_seperator = "/"
+    def refresh_full_names(self, old_names=None):
+        """
+            set correct value for (full_name, full_slug) fields of this node
+             and its whole subtree after a rename, re-slug or move.
 
-    @property
-    def full_slug(self) -> str:
-        slugs = [category.slug for category in self.get_ancestors()]
-        slugs.append(self.slug)
-        return self._full_slug_seperator.join(slugs)
+            - `old_names` are the stored values of this node the descendants were built from,
+             read from the database when omitted.
+        """
+        old_name, old_slug = old_names or self._stored_full_names()
+        self.full_name, self.full_slug = self._build_full_names()
+        if (old_name, old_slug) == (self.full_name, self.full_slug):
+            return
+
+        type(self)._default_manager.filter(pk=self.pk).update(
+            full_name=self.full_name, full_slug=self.full_slug
+        )
+        self._refresh_descendant_full_names(old_name, old_slug)
+
+    def _refresh_descendant_full_names(self, old_name, old_slug):
+        # descendants share this node's old values as a prefix,
+        #  so the subtree is rewritten with a single update by swapping that prefix
+        type(self)._default_manager.filter(path__startswith=self.path, depth__gt=self.depth).update(
+            full_name=Concat(
+                models.Value(self.full_name), Substr("full_name", len(old_name) + 1)
+            ),
+            full_slug=Concat(
+                models.Value(self.full_slug), Substr("full_slug", len(old_slug) + 1)
+            ),
+        )
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        # built from the stored parent, the values of this instance may be stale
+        self.full_name, self.full_slug = self._build_full_names()
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        old_names = self._stored_full_names()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "full_name", "full_slug"}
         super().save(*args, **kwargs)
+        if old_names != (self.full_name, self.full_slug):
+            self._refresh_descendant_full_names(*old_names)
+
+    def move(self, target, pos=None):
+        old_ancestors = list(self.get_ancestors().values_list("pk", flat=True))
+        super().move(target, pos)
+        # treebeard rewrites paths with raw updates, so the instance and the
+        #  denormalised names, counts and caches follow here
+        self.refresh_from_db(fields=["path", "depth", "numchild"])
+        self.refresh_full_names()
+        CategoryProductCount.objects.refresh([*old_ancestors, self.pk])
+        invalidate_category_tree()
+        invalidate_tags(model_tag(type(self)))
 
     def refresh_ancestors_are_public(self):
         """
@@ -94,16 +208,7 @@ class Category(MP_Node, BaseSeoModel, ModelWithDescription):
 
             - this method avoid run a new save for each updated object.
         """
-        subquery = type(self)._default_manager.filter(
-            is_public=False,
-            path__rstartswith=models.OuterRef("path"),
-            depth__lt=models.OuterRef("depth")
-        )
-
-        self.get_tree(self).update(
-            ancestors_are_public=~models.Exists(subquery.values("pk"))
-        )
-
+        type(self)._default_manager.refresh_ancestors_are_public([self])
         self.refresh_from_db()
 
     def has_children(self):
@@ -139,3 +244,86 @@ class ProductCategory(models.Model):
 
     def __str__(self):
         return "%s is in the %s category" % (self.product, self.category)
+
+
+def count_public_products(categories):
+    """
+        annotate (direct_count, subtree_count) of public products on a Category queryset.
+
+        - subtree counts are distinct, a product listed in two nodes of a subtree counts once.
+    """
+    public = ProductCategory.objects.filter(product__is_public=True).order_by()
+    return categories.annotate(
+        direct_count=Coalesce(
+            models.Subquery(
+                public.filter(category=models.OuterRef("pk"))
+                .values("category")
+                .annotate(count=models.Count("product"))
+                .values("count")
+            ),
+            0,
+        ),
+        subtree_count=Coalesce(
+            models.Subquery(
+                public.filter(category__path__startswith=models.OuterRef("path"))
+                .annotate(group=models.Value(1))
+                .values("group")
+                .annotate(count=models.Count("product", distinct=True))
+                .values("count")
+            ),
+            0,
+        ),
+    )
+
+
+class CategoryProductCountManager(models.Manager):
+    def _store(self, categories):
+        rows = count_public_products(categories).values_list("pk", "direct_count", "subtree_count")
+        return self.bulk_create(
+            [
+                self.model(category_id=pk, direct_count=direct, subtree_count=subtree)
+                for pk, direct, subtree in rows
+            ],
+            update_conflicts=True,
+            unique_fields=["category"],
+            update_fields=["direct_count", "subtree_count"],
+            batch_size=1000,
+        )
+
+    def refresh(self, category_ids):
+        """
+            recount the given categories together with all of their ancestors,
+             the only nodes whose counts can change when a product of them changes.
+        """
+        steplen = Category.steplen
+        paths = Category.objects.filter(pk__in=category_ids).values_list("path", flat=True)
+        branch = {path[:end] for path in paths for end in range(steplen, len(path) + 1, steplen)}
+        if branch:
+            self._store(Category.objects.filter(path__in=branch))
+
+    def rebuild(self):
+        self.all().delete()
+        self._store(Category.objects.all())
+
+
+class CategoryProductCount(models.Model):
+    """
+        materialised number of public products of each category,
+         directly linked to it (direct_count) and anywhere in its subtree (subtree_count).
+
+        - rows are kept up to date by the handlers in `catalogue.signals`.
+    """
+
+    category = models.OneToOneField(
+        "catalogue.Category", on_delete=models.CASCADE, primary_key=True, related_name="product_count"
+    )
+    direct_count = models.PositiveIntegerField(default=0)
+    subtree_count = models.PositiveIntegerField(default=0)
+
+    objects = CategoryProductCountManager()
+
+    class Meta:
+        app_label = "catalogue"
+
+    def __str__(self):
+        return "%s: %s (%s)" % (self.category_id, self.subtree_count, self.direct_count)
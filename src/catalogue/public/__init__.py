@@ -0,0 +1,3 @@
+from .queries import CatalogueQuery
+
+__all__ = ["CatalogueQuery"]
@@ -0,0 +1,32 @@
+import strawberry
+import strawberry_django
+from strawberry.types import Info
+
+from utils.response_cache import cache_hint
+from utils.translations import get_request_language
+
+from .. import models
+from ..tree import TREE_RESPONSE_TAG, get_category_tree
+from .types import CategoryMenuItemType, CategoryType
+
+
+@strawberry.type
+class CatalogueQuery:
+    @strawberry_django.field(
+        description="Browsable category tree, read from the cached tree without SQL",
+        metadata=cache_hint(300, tags=[TREE_RESPONSE_TAG]),
+    )
+    def category_menu(
+        self, info: Info, max_depth: int | None = None, language: str | None = None
+    ) -> list[CategoryMenuItemType]:
+        menu = get_category_tree().menu(
+            language_code=get_request_language(info, language), max_depth=max_depth
+        )
+        return [CategoryMenuItemType.from_menu(item) for item in menu]
+
+    @strawberry_django.field(description="Browsable category by its full slug")
+    def category(self, full_slug: str) -> CategoryType | None:
+        node = get_category_tree().get_by_full_slug(full_slug)
+        if node is None or not node.is_browsable:
+            return None
+        return models.Category.objects.filter(pk=node.pk)
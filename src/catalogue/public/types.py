@@ -0,0 +1,103 @@
+from typing import Self
+
+import strawberry
+import strawberry_django
+from strawberry import auto, relay
+from strawberry.types import Info
+
+from utils.response_cache import cache_hint
+from utils.translations import get_request_language, prefetch_translations, resolve_translation
+from utils.types import BaseSeoModelType, TranslationModelType
+
+from .. import models
+from ..tree import TREE_RESPONSE_TAG, CategoryNode, get_category_tree
+
+
+@strawberry.type
+class CategoryLinkType:
+    """A node of the cached category tree, enough to link to a category page."""
+
+    name: str
+    slug: str
+    full_slug: str
+
+    @classmethod
+    def from_node(cls, node: CategoryNode, language: str | None) -> Self:
+        return cls(name=node.get_name(language), slug=node.slug, full_slug=node.full_slug)
+
+
+@strawberry.type
+class CategoryMenuItemType(CategoryLinkType):
+    children: list[Self]
+
+    @classmethod
+    def from_menu(cls, item: dict) -> Self:
+        return cls(
+            name=item["name"],
+            slug=item["slug"],
+            full_slug=item["full_slug"],
+            children=[cls.from_menu(child) for child in item["children"]],
+        )
+
+
+@strawberry_django.type(models.CategoryTranslation)
+class CategoryTranslationType(TranslationModelType):
+    name: auto
+    description: auto
+
+
+@strawberry_django.type(models.Category)
+class CategoryType(relay.Node, BaseSeoModelType):
+    name: auto
+    slug: auto
+    full_name: auto
+    full_slug: auto
+    description: auto
+
+    @classmethod
+    def get_queryset(cls, queryset, info: Info, **kwargs):
+        return queryset.filter(is_public=True, ancestors_are_public=True)
+
+    @strawberry_django.field(
+        description="Number of public products anywhere in the subtree of this category",
+        select_related=["product_count"],
+        only=["product_count__subtree_count"],
+        metadata=cache_hint(60),
+    )
+    def product_count(self) -> int:
+        return self.product_count.subtree_count
+
+    @strawberry_django.field(
+        description="Browsable children of this category, read from the cached tree",
+        only=["pk"],
+        metadata=cache_hint(tags=[TREE_RESPONSE_TAG]),
+    )
+    def children(self, info: Info) -> list[CategoryLinkType]:
+        language = get_request_language(info)
+        return [
+            CategoryLinkType.from_node(node, language)
+            for node in get_category_tree().get_children(self.pk, browsable=True)
+        ]
+
+    @strawberry_django.field(
+        description="Breadcrumbs of this category, root first, read from the cached tree",
+        only=["pk"],
+        metadata=cache_hint(tags=[TREE_RESPONSE_TAG]),
+    )
+    def ancestors(self, info: Info) -> list[CategoryLinkType]:
+        language = get_request_language(info)
+        return [
+            CategoryLinkType.from_node(node, language)
+            for node in get_category_tree().get_ancestors(self.pk)
+        ]
+
+    @strawberry_django.field(
+        description="Translation in the requested language, falling back to the default one",
+        prefetch_related=[
+            prefetch_translations(models.CategoryTranslation, to_attr="fallback_translations")
+        ],
+    )
+    def translation(
+        self, info: Info, language: str | None = None
+    ) -> CategoryTranslationType | None:
+        return resolve_translation(self, info, language, to_attr="fallback_translations")
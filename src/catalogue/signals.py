@@ -0,0 +1,115 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from products.models import Product
+from utils.response_cache import invalidate_instance, invalidate_tags, model_tag
+
+from .models import Category, CategoryProductCount, CategoryTranslation, ProductCategory
+from .tree import invalidate_category_tree
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=CategoryTranslation)
+@receiver(post_delete, sender=CategoryTranslation)
+def invalidate_category_tree_on_change(sender, **kwargs):
+    invalidate_category_tree()
+
+
+def _deletes_categories(origin):
+    return isinstance(origin, Category) or (
+        isinstance(origin, QuerySet) and issubclass(origin.model, Category)
+    )
+
+
+@receiver(post_save, sender=Category)
+def create_product_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        CategoryProductCount.objects.create(category=instance)
+
+
+@receiver(post_delete, sender=Category)
+def refresh_product_count_on_category_delete(sender, instance, **kwargs):
+    # runs once the whole deleted subtree is gone, so only surviving ancestors are recounted
+    if instance.depth > 1:
+        CategoryProductCount.objects.refresh(
+            Category.objects.filter(path=instance.path[: -Category.steplen]).values_list("pk", flat=True)
+        )
+
+
+@receiver(post_save, sender=ProductCategory)
+def refresh_product_count_on_link_save(sender, instance, **kwargs):
+    CategoryProductCount.objects.refresh([instance.category_id])
+
+
+@receiver(post_delete, sender=ProductCategory)
+def refresh_product_count_on_link_delete(sender, instance, origin=None, **kwargs):
+    # links cascading from a category delete belong to categories about to be deleted
+    if not _deletes_categories(origin):
+        CategoryProductCount.objects.refresh([instance.category_id])
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def refresh_product_count_on_categories_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            CategoryProductCount.objects.refresh([instance.pk])
+    elif action == "pre_clear":
+        instance._cleared_category_ids = list(instance.categories.values_list("pk", flat=True))
+    elif action == "post_clear":
+        CategoryProductCount.objects.refresh(instance.__dict__.pop("_cleared_category_ids", []))
+    elif action in ("post_add", "post_remove"):
+        CategoryProductCount.objects.refresh(pk_set)
+
+
+def _saves_is_public(update_fields):
+    return update_fields is None or "is_public" in update_fields
+
+
+@receiver(pre_save, sender=Product)
+def remember_product_is_public(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is not None and _saves_is_public(update_fields):
+        instance._stored_is_public = (
+            sender.objects.filter(pk=instance.pk).values_list("is_public", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Product)
+def refresh_product_count_on_publish(sender, instance, created, update_fields=None, **kwargs):
+    stored_is_public = instance.__dict__.pop("_stored_is_public", None)
+    if created or not _saves_is_public(update_fields) or stored_is_public == instance.is_public:
+        return
+    CategoryProductCount.objects.refresh(
+        ProductCategory.objects.filter(product=instance).values_list("category_id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_category_responses(sender, instance, **kwargs):
+    invalidate_instance(Category, instance.pk)
+
+
+@receiver(post_save, sender=CategoryTranslation)
+@receiver(post_delete, sender=CategoryTranslation)
+def invalidate_cached_translation_responses(sender, instance, **kwargs):
+    invalidate_instance(Category, instance.category_id)
+
+
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+def invalidate_cached_product_category_responses(sender, instance, **kwargs):
+    invalidate_instance(Category, instance.category_id)
+    invalidate_instance(Product, instance.product_id)
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def invalidate_cached_responses_on_categories_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    invalidate_instance(type(instance), instance.pk)
+    for pk in pk_set or ():
+        invalidate_instance(model, pk)
+    if pk_set is None:
+        invalidate_tags(model_tag(model))
@@ -0,0 +1,154 @@
+from typing import NamedTuple
+
+from django.apps import apps
+
+from utils.response_cache import invalidate_tags
+from utils.snapshots import VersionedSnapshot
+
+TREE_VERSION_CACHE_KEY = "catalogue:category-tree:version"
+TREE_CACHE_KEY = "catalogue:category-tree:%s"
+TREE_CACHE_TIMEOUT = 60 * 60 * 24
+# response cache tag of the fields reading the tree, see `utils.response_cache.cache_hint`
+TREE_RESPONSE_TAG = "catalogue:category-tree"
+
+_FIELDS = (
+    "pk", "path", "depth", "name", "slug", "full_slug", "is_public", "ancestors_are_public",
+)
+
+
+class CategoryNode(NamedTuple):
+    pk: int
+    path: str
+    depth: int
+    name: str
+    slug: str
+    full_slug: str
+    is_public: bool
+    ancestors_are_public: bool
+    translations: dict | None
+
+    @property
+    def is_browsable(self) -> bool:
+        return self.is_public and self.ancestors_are_public
+
+    def get_name(self, language_code: str | None = None) -> str:
+        if language_code and self.translations:
+            return self.translations.get(language_code) or self.name
+        return self.name
+
+
+class CategoryTree:
+    """
+    Read-only snapshot of the whole category tree, for menus and breadcrumbs.
+
+    `rows` holds plain tuples in path order and is what gets cached,
+     the lookups are rebuilt from them in every process.
+    """
+
+    def __init__(self, rows, version=None):
+        self.rows = rows
+        self.version = version
+        self.nodes = {}
+        self._by_path = {}
+        self._by_full_slug = {}
+        self._children = {}
+        self._roots = []
+
+        steplen = apps.get_model("catalogue", "Category").steplen
+        for row in rows:
+            node = CategoryNode(*row)
+            self.nodes[node.pk] = node
+            self._by_path[node.path] = node
+            self._by_full_slug[node.full_slug] = node
+            if node.depth == 1:
+                self._roots.append(node)
+            else:
+                parent = self._by_path[node.path[:-steplen]]
+                self._children.setdefault(parent.pk, []).append(node)
+
+    @classmethod
+    def build(cls, version=None) -> "CategoryTree":
+        """Loads the tree together with translated names in a single query."""
+        Category = apps.get_model("catalogue", "Category")
+        queryset = Category.objects.order_by("path", "translations__language_code").values_list(
+            *_FIELDS, "translations__language_code", "translations__name"
+        )
+
+        rows = []
+        for *fields, language_code, translated_name in queryset.iterator(chunk_size=5000):
+            if not rows or rows[-1][0] != fields[0]:
+                rows.append((*fields, None))
+            if translated_name:
+                translations = rows[-1][-1]
+                if translations is None:
+                    translations = {}
+                    rows[-1] = (*fields, translations)
+                translations[language_code] = translated_name
+        return cls(rows, version=version)
+
+    def get(self, pk) -> CategoryNode | None:
+        return self.nodes.get(int(pk))
+
+    def get_by_full_slug(self, full_slug: str) -> CategoryNode | None:
+        return self._by_full_slug.get(full_slug)
+
+    def get_root_nodes(self, browsable=False) -> list[CategoryNode]:
+        return [node for node in self._roots if not browsable or node.is_browsable]
+
+    def get_children(self, pk, browsable=False) -> list[CategoryNode]:
+        return [
+            node for node in self._children.get(int(pk), ())
+            if not browsable or node.is_browsable
+        ]
+
+    def get_ancestors(self, pk) -> list[CategoryNode]:
+        """Breadcrumbs of the node, root first and excluding the node itself."""
+        node = self.get(pk)
+        if node is None:
+            return []
+        steplen = len(node.path) // node.depth
+        return [self._by_path[node.path[:end]] for end in range(steplen, len(node.path), steplen)]
+
+    def menu(self, language_code=None, max_depth=None) -> list[dict]:
+        """Nested browsable nodes, ready to render as a menu."""
+
+        def build(nodes):
+            return [
+                {
+                    "id": node.pk,
+                    "name": node.get_name(language_code),
+                    "slug": node.slug,
+                    "full_slug": node.full_slug,
+                    "children": (
+                        build(self.get_children(node.pk, browsable=True))
+                        if max_depth is None or node.depth < max_depth else []
+                    ),
+                }
+                for node in nodes
+            ]
+
+        return build(self.get_root_nodes(browsable=True))
+
+
+_snapshot = VersionedSnapshot(
+    TREE_VERSION_CACHE_KEY,
+    lambda version: CategoryTree.build(version=version),
+    cache_key=TREE_CACHE_KEY,
+    dump=lambda tree: tree.rows,
+    load=lambda rows, version: CategoryTree(rows, version=version),
+    timeout=TREE_CACHE_TIMEOUT,
+)
+
+
+def get_category_tree() -> CategoryTree:
+    """
+    The snapshot of this process; once the shared version moves on it is taken
+     from the shared cache, or built and put there by the first process to miss it.
+    """
+    return _snapshot.get()
+
+
+def invalidate_category_tree():
+    """Drops the snapshot (see `VersionedSnapshot.invalidate`) and the responses read from it."""
+    _snapshot.invalidate()
+    invalidate_tags(TREE_RESPONSE_TAG)
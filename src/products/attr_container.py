@@ -3,18 +3,29 @@ from django.utils.functional import cached_property
 ProductAttributeValue = ...  # Placeholder to avoid import error; used only for documentation.
 
 
+def annotate_attribute_values(queryset) -> QuerySet[ProductAttributeValue]:
+    return queryset.select_related("attribute").annotate(
+        code=F("attribute__slug"),
+        value_type=F("attribute__input_type")
+    )
+
+
 class AttributeCache(dict):
     def __init__(self, product):
         self.product = product
         self._attribute_value_iterator = None
-        self.pks = list(self.attribute_value.values_list("attribute__pk", flat=True))
+        prefetched = getattr(product, "_prefetched_objects_cache", {}).get("attribute_values")
+        if prefetched is not None:
+            # Seeded by `Product.objects.with_attributes()`, nothing is left to be fetched.
+            self.update((att_val.code, att_val) for att_val in prefetched)
+            self._attribute_value_iterator = iter(())
+            self.pks = [att_val.attribute_id for att_val in prefetched]
+        else:
+            self.pks = list(self.attribute_value.values_list("attribute__pk", flat=True))
 
     @cached_property
     def attribute_value(self) -> QuerySet[ProductAttributeValue]:
-        return self.product.attribute_values.select_related("attribute").annotate(
-            code=F("attribute__slug"),
-            value_type=F("attribute__value_type")
-        )
+        return annotate_attribute_values(self.product.attribute_values.all())
 
     def attribute_value_iterator(self):
         if self._attribute_value_iterator is None:
@@ -35,8 +46,8 @@ class AttributeCache(dict):
 
 class ProductAttributeContainer:
     def __init__(self, model_instance):
-        # WARNING: This method is called during the initialization of a product instance,
-        #  so it should be cheap and have very lazy behavior.
+        # NOTE: Created on first access of `product.attr` (see Product.attr),
+        #  it should still be cheap and have very lazy behavior.
         self.product = model_instance
         self._cache = None
         self._dirty = []
@@ -44,6 +55,9 @@ class ProductAttributeContainer:
     def all(self) -> QuerySet[ProductAttributeValue]:
         return self.cache().attribute_value
 
+    def get(self, attribute_code, default=None):
+        return self.cache().get(attribute_code, default)
+
     def cache(self):
         if self._cache is None:
             self._cache =  AttributeCache(self.product)
@@ -1,9 +1,8 @@
 import strawberry
 from strawberry_django import connection
-from .types import ProductType
-from utils.relay import CursorConnection
+from .types import ProductCursorConnection
 
 
 @strawberry.type
 class ProductQuery:
-    products: CursorConnection[ProductType] = connection(max_results=20)
+    products: ProductCursorConnection = connection(max_results=20)
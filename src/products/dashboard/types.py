@@ -1,16 +1,92 @@
-from strawberry import auto, lazy
-from strawberry.relay import Node
+import strawberry
+from django.apps import apps
+from django.db.models import Q
+from strawberry import UNSET, auto, lazy
+from strawberry.relay import GlobalID, Node
 import strawberry_django
+from strawberry_django import BaseFilterLookup
+from strawberry_django.resolvers import django_resolver
+from strawberry.types import Info
+from catalogue.tree import get_category_tree
+from utils.relay import CursorConnection
+from utils.translations import prefetch_translations, resolve_translation, resolve_translations
 from utils.types import BaseSeoModelType, ModelWithDescriptionType, TranslationModelType
 from .. import models
-from typing import Annotated, TYPE_CHECKING
+from ..graphql_types import (
+    AttributeFilterInput,
+    ProductAttributeType,
+    attribute_values_prefetch,
+    resolve_attributes,
+)
+from ..managers import ProductAttributeFilterDict, category_product_ids
+from typing import Annotated, Optional, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
     from catalogue.dashboard.types import CategoryType
 
 
-@strawberry_django.type(models.Product)
+@strawberry_django.filter_type(models.Product, lookups=True)
+class ProductFilterType:
+    id: Optional[BaseFilterLookup[GlobalID]] = UNSET
+    title: auto
+    slug: auto
+    is_public: auto
+    updated_at: auto
+
+    @strawberry_django.filter_field(
+        description="Products linked to this category or any node of its subtree"
+    )
+    def category(self, queryset, value: GlobalID, prefix: str):
+        # the path comes from the cached tree, the subtree is one indexed LIKE subquery
+        node = None
+        if value.type_name == "CategoryType" and value.node_id.isdigit():
+            node = get_category_tree().get(value.node_id)
+        if node is None:
+            return queryset, Q(**{f"{prefix}pk__in": []})
+        return queryset, Q(**{f"{prefix}pk__in": category_product_ids(node)})
+
+    @strawberry_django.filter_field(
+        description="Products of this product class or of any class inheriting from it"
+    )
+    def product_class(self, queryset, value: GlobalID, prefix: str):
+        if value.type_name != "ProductClassType" or not value.node_id.isdigit():
+            return queryset, Q(**{f"{prefix}pk__in": []})
+        ProductClassClosure = apps.get_model("products", "ProductClassClosure")
+        descendants = ProductClassClosure.objects.filter(ancestor_id=value.node_id)
+        return queryset, Q(**{f"{prefix}product_type_id": value.node_id}) | Q(
+            **{f"{prefix}product_type__in": descendants.values("descendant_id")}
+        )
+
+    @strawberry_django.filter_field(
+        description="Products having one of the `values` of every given attribute"
+    )
+    def attributes(self, queryset, value: list[AttributeFilterInput], prefix: str):
+        # one grouped subquery over the facet index, see ProductQuerySet.filter_by_attribute
+        filters = ProductAttributeFilterDict.from_values((item.attribute, item.values) for item in value)
+        if not filters:
+            return queryset, Q()
+        product_ids = filters.product_ids()
+        return queryset, Q(**{f"{prefix}pk__in": [] if product_ids is None else product_ids})
+
+
+@strawberry_django.order_type(models.Product)
+class ProductOrderType:
+    title: auto
+    created_at: auto
+    updated_at: auto
+
+
+@strawberry_django.type(models.ProductClass)
+class ProductClassType(Node):
+    title: auto
+    slug: auto
+    abstract: auto
+    require_shipping: auto
+    track_stock: auto
+
+
+@strawberry_django.type(models.Product, filters=ProductFilterType, ordering=ProductOrderType)
 class ProductType(Node, BaseSeoModelType, ModelWithDescriptionType):
     title: auto
     slug: auto
@@ -18,15 +94,79 @@ class ProductType(Node, BaseSeoModelType, ModelWithDescriptionType):
     created_at: auto
     updated_at: auto
     categories: list[Annotated["CategoryType", lazy("catalogue.dashboard.types")]]
-    translations: list["ProductTranslateType"]
-    # attributes:
-    # product_type:
 
+    @strawberry_django.field(
+        description="Translations of this product, only the requested language when one is asked",
+        prefetch_related=[prefetch_translations(models.ProductTranslation)],
+    )
+    def translations(
+        self, info: Info, language: str | None = None
+    ) -> list["ProductTranslateType"]:
+        return resolve_translations(self, info, language)
 
-class ProductClassType: ...
+    @strawberry_django.field(
+        description="Translation in the requested language, falling back to the default one",
+        prefetch_related=[
+            prefetch_translations(models.ProductTranslation, to_attr="fallback_translations")
+        ],
+    )
+    def translation(
+        self, info: Info, language: str | None = None
+    ) -> Optional["ProductTranslateType"]:
+        return resolve_translation(self, info, language, to_attr="fallback_translations")
 
+    product_type: ProductClassType
 
-@strawberry_django.type(models.ProductTranslate)
+    @strawberry_django.field(
+        description="Attribute values of this product",
+        prefetch_related=[attribute_values_prefetch()],
+    )
+    def attributes(self) -> list[ProductAttributeType]:
+        return resolve_attributes(self)
+
+
+@strawberry_django.type(models.ProductTranslation)
 class ProductTranslateType(Node, TranslationModelType):
     title: auto
     description: auto
+
+
+@strawberry.type
+class AttributeFacetValueType:
+    value: str | None
+    label: str | None
+    count: int
+
+
+@strawberry.type
+class AttributeFacetType:
+    attribute: str
+    values: list[AttributeFacetValueType]
+
+
+@strawberry.type(name="ProductCursorConnection")
+class ProductCursorConnection(CursorConnection[ProductType]):
+    TOTAL_COUNT_MODE = "approximate"
+
+    @strawberry.field(
+        description="Number of matching products per value of the requested attributes"
+    )
+    def facets(self, attributes: list[str]) -> list[AttributeFacetType]:
+        def resolve():
+            counts = models.Product.objects.facet_counts(
+                self.total_count_qs, attributes=attributes
+            )
+            return [
+                AttributeFacetType(
+                    attribute=slug,
+                    values=[
+                        AttributeFacetValueType(
+                            value=row["value"], label=row["label"], count=row["count"]
+                        )
+                        for row in rows
+                    ],
+                )
+                for slug, rows in counts.items()
+            ]
+
+        return django_resolver(resolve)()
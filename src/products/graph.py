@@ -0,0 +1,115 @@
+import copy
+
+from utils.snapshots import VersionedSnapshot
+
+
+def topological_sort(children: dict) -> tuple[list | None, list | None]:
+    """
+    Orders the nodes of a `{parent: [children]}` graph, parents first.
+
+    Returns `(order, None)` for a DAG, or `(None, cycle)` where cycle is
+     the offending path, e.g. `[a, b, c, a]`.
+    """
+    nodes = sorted({*children, *(child for nodes in children.values() for child in nodes)})
+    order, done, visiting = [], set(), set()
+
+    for root in nodes:
+        if root in done:
+            continue
+        path = [root]
+        stack = [iter(children.get(root, ()))]
+        visiting.add(root)
+        while stack:
+            for child in stack[-1]:
+                if child in visiting:
+                    return None, path[path.index(child) :] + [child]
+                if child not in done:
+                    visiting.add(child)
+                    path.append(child)
+                    stack.append(iter(children.get(child, ())))
+                    break
+            else:
+                stack.pop()
+                node = path.pop()
+                visiting.discard(node)
+                done.add(node)
+                order.append(node)
+
+    order.reverse()
+    return order, None
+
+
+class ProductClassGraph:
+    """
+    Read-only, in-memory snapshot of the ProductClass DAG:
+     classes, adjacency lists, a topological order and the ancestor and
+     descendant sets of every class (with the shortest distance to each).
+    """
+
+    def __init__(self, classes, edges, version=None):
+        self.version = version
+        self.classes = {product_class.pk: product_class for product_class in classes}
+        self.parents = {pk: [] for pk in self.classes}
+        self.children = {pk: [] for pk in self.classes}
+        for parent_id, child_id in edges:
+            self.parents[child_id].append(parent_id)
+            self.children[parent_id].append(child_id)
+
+        self.order, _ = topological_sort(self.children)
+        self.ancestors = self._closure(self.order, self.parents)
+        self.descendants = self._closure(reversed(self.order), self.children)
+
+    @staticmethod
+    def _closure(order, graph):
+        """`{node: {reachable node: shortest distance}}`, each node visited after its `graph` neighbours."""
+        closure = {}
+        for node in order:
+            reachable = {}
+            for neighbour in graph[node]:
+                for other, depth in ((neighbour, 0), *closure[neighbour].items()):
+                    if depth + 1 < reachable.get(other, float("inf")):
+                        reachable[other] = depth + 1
+            closure[node] = reachable
+        return closure
+
+    @classmethod
+    def build(cls, version=None):
+        from .models import ProductClass, ProductClassEdge
+
+        return cls(
+            ProductClass.objects.all(),
+            ProductClassEdge.objects.values_list("parent_id", "child_id"),
+            version=version,
+        )
+
+    def _resolve(self, pk, related, include_self):
+        depths = related.get(pk, {})
+        if include_self:
+            depths = {pk: 0, **depths}
+        return [
+            copy.copy(self.classes[other])
+            for other, _ in sorted(depths.items(), key=lambda item: (item[1], item[0]))
+        ]
+
+    def get_ancestors(self, pk, include_self=False):
+        return self._resolve(pk, self.ancestors, include_self)
+
+    def get_descendants(self, pk, include_self=False):
+        return self._resolve(pk, self.descendants, include_self)
+
+
+GRAPH_VERSION_CACHE_KEY = "products:product-class-graph:version"
+
+_snapshot = VersionedSnapshot(
+    GRAPH_VERSION_CACHE_KEY, lambda version: ProductClassGraph.build(version=version)
+)
+
+
+def get_product_class_graph() -> ProductClassGraph:
+    """The snapshot of this process, see `VersionedSnapshot`."""
+    return _snapshot.get()
+
+
+def invalidate_product_class_graph():
+    """Drops the snapshot, see `VersionedSnapshot.invalidate`."""
+    _snapshot.invalidate()
@@ -0,0 +1,79 @@
+import datetime
+
+import strawberry
+from django.db.models import Prefetch
+
+from . import models
+from .attr_container import annotate_attribute_values
+from .models.attributes import AttributeInputType
+
+
+# shared by the dashboard and public schemas, so both expose the same inputs and values
+@strawberry.input
+class AttributeFilterInput:
+    attribute: str
+    values: list[str]
+
+
+@strawberry.type(
+    description="Attribute value of a product, `value` is its text form and the typed fields "
+    "hold it as the input type of the attribute stores it"
+)
+class ProductAttributeType:
+    attribute: str
+    input_type: str
+    label: str | None
+    value: str | None
+    numeric: float | None = None
+    boolean: bool | None = None
+    date: datetime.date | None = None
+    date_time: datetime.datetime | None = None
+
+    @classmethod
+    def from_value(cls, attribute_value: models.AttributeValue) -> "ProductAttributeType":
+        typed_value = attribute_value.typed_value
+        input_type = attribute_value.attribute.input_type
+        attribute_type = cls(
+            attribute=attribute_value.code,
+            input_type=input_type,
+            label=attribute_value.label,
+            value=_as_text(typed_value),
+        )
+        if input_type == AttributeInputType.NUMERIC:
+            attribute_type.numeric = typed_value
+        elif input_type == AttributeInputType.BOOLEAN:
+            attribute_type.boolean = typed_value
+        elif input_type == AttributeInputType.DATE:
+            attribute_type.date = typed_value
+        elif input_type == AttributeInputType.DATE_TIME:
+            attribute_type.date_time = typed_value
+        return attribute_type
+
+
+def _as_text(typed_value) -> str | None:
+    if typed_value is None or isinstance(typed_value, str):
+        return typed_value
+    if isinstance(typed_value, bool):
+        return "true" if typed_value else "false"
+    if isinstance(typed_value, float) and typed_value.is_integer():
+        return str(int(typed_value))
+    if isinstance(typed_value, (datetime.date, datetime.datetime)):
+        return typed_value.isoformat()
+    return str(typed_value)
+
+
+def attribute_values_prefetch() -> Prefetch:
+    """Prefetch of the attribute values of products, loading every typed column `ProductAttributeType` reads."""
+    return Prefetch(
+        "attribute_values",
+        queryset=annotate_attribute_values(
+            models.AttributeValue.objects.only(
+                "label", "value", "numeric", "boolean", "date_time", "attribute__slug", "attribute__input_type"
+            )
+        ),
+    )
+
+
+def resolve_attributes(product) -> list[ProductAttributeType]:
+    """Attribute values of `product`, read from the rows of `attribute_values_prefetch`."""
+    return [ProductAttributeType.from_value(value) for value in product.attribute_values.all()]
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from products.models import ProductAttributeFacet
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product attribute facet index."
+
+    def handle(self, *args, **options):
+        ProductAttributeFacet.objects.rebuild()
+        self.stdout.write(
+            "%d facets indexed." % ProductAttributeFacet.objects.count()
+        )
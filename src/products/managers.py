@@ -1,75 +1,327 @@
-from django.db import connection, models
+from collections import defaultdict, deque
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
 from django.db.models.constants import LOOKUP_SEP
 
+from utils.translations import translations_prefetch
+
+from .attr_container import annotate_attribute_values
+from .graph import invalidate_product_class_graph, topological_sort
+from .units import CONVERSION_FACTORS
+
 
 class ProductAttributeFilterDict(dict):
+    """
+    `(lookup, value)` filters keyed by attribute code,
+     several filters on one attribute (e.g. both bounds of a range) must all match.
+    """
+
     def __init__(self, **filters):
         super().__init__()
         for key, value in filters.items():
             if LOOKUP_SEP in key:
                 field, lookup = key.split(LOOKUP_SEP, 1)
-                self[field] = (lookup, value)
             else:
-                self[key] = (None, value)
+                field, lookup = key, None
+            self.setdefault(field, []).append((lookup, value))
+
+    @classmethod
+    def from_values(cls, attributes):
+        """
+        Filter of `(<attribute code>, [<value>, ...])` pairs sent by clients.
+
+        - values of a code given more than once are merged instead of the last ones winning.
+        - codes holding a lookup separator are rejected, so clients can't pick lookups.
+        """
+        values = {}
+        for code, code_values in attributes:
+            if LOOKUP_SEP in code:
+                raise ValidationError("%r is not a valid attribute code." % code, code="invalid")
+            values.setdefault(code, {}).update(dict.fromkeys(code_values))
+        return cls(**{f"{code}__in": list(code_values) for code, code_values in values.items()})
 
-    def _Q_object(self, lookup, value):
+    def _Q_object(self, field, lookup, value):
         kwargs = {}
-        key = "attribute_values__value__value"
+        key = field
         if lookup:
             key = f"{key}{LOOKUP_SEP}{lookup}"
         kwargs[key] = value
         return models.Q(**kwargs)
 
+    def facet_condition(self):
+        """
+        One OR-ed condition over the facet index, a facet row matches it
+         if its value satisfies the filter of its own attribute.
+
+        - filters of one attribute are AND-ed on the same value row.
+        - each filter runs on the typed column of its attribute
+         (see Attribute.value_field), so range lookups are index-backed
+         and compare numbers and dates rather than text.
+        - returns None if some of the attributes don't exist.
+        """
+        Attribute = apps.get_model("products", "Attribute")
+        AttributeValue = apps.get_model("products", "AttributeValue")
+        attributes = {
+            attribute.slug: attribute
+            for attribute in Attribute.objects.filter(slug__in=self.keys()).only(
+                "slug", "input_type"
+            )
+        }
+        if len(attributes) != len(self):
+            return None
+
+        condition = models.Q()
+        for slug, filters in self.items():
+            attribute = attributes[slug]
+            selected_values = AttributeValue.objects.filter(attribute=attribute)
+            for lookup, value in filters:
+                selected_values = selected_values.filter(
+                    self._Q_object(
+                        attribute.value_field, lookup, attribute.prepare_filter_value(value)
+                    )
+                )
+            condition |= models.Q(
+                attribute=attribute, value__in=selected_values.values("pk")
+            )
+        return condition
+
+    def product_ids(self):
+        """Subquery of the ids of the matching products, None if some of the attributes don't exist."""
+        condition = self.facet_condition()
+        if condition is None:
+            return None
+
+        ProductAttributeFacet = apps.get_model("products", "ProductAttributeFacet")
+        return ProductAttributeFacet.objects.matching_products(
+            condition, attributes_count=len(self)
+        )
+
     def querying(self, queryset):
-        qs = queryset
-        for slug, (lookup, value) in self.items():
-            selected_values = self._Q_object(lookup, value)
-            if not selected_values:
-                return queryset.none()
-            qs = qs.filter(selected_values, attribute_values__attribute__slug=slug)
+        if not self:
+            return queryset
+
+        product_ids = self.product_ids()
+        if product_ids is None:
+            return queryset.none()
+        return queryset.filter(pk__in=product_ids)
 
-        return qs
 
+def category_product_ids(category, include_descendants=True):
+    """
+    Subquery of the ids of the products linked to `category` or,
+     with `include_descendants`, to any node of its subtree.
 
-class ProductManager(models.Manager):  # XXX test required
+    - the subtree is matched with one indexed (path LIKE 'prefix%') join on ProductCategory,
+     so products listed in several nodes are never duplicated.
+    """
+    ProductCategory = apps.get_model("catalogue", "ProductCategory")
+    if include_descendants:
+        links = ProductCategory.objects.filter(category__path__startswith=category.path)
+    else:
+        links = ProductCategory.objects.filter(category=category)
+    return links.values("product_id")
+
+
+class ProductQuerySet(models.QuerySet):
     def filter_by_attribute(self, **kwargs):
         """
         Allows querying by attribute:
             Product.objects.filter_by_attribute(<ProductAttribute>=<value>,<ProductAttribute>__lookups=<value>)
             Product.objects.filter_by_attribute(size="XL", color__in=["red", "blue"])
+
+        - filters are resolved against the facet index (ProductAttributeFacet)
+         as a single grouped subquery, so adding attributes doesn't add joins
+         and never duplicates rows.
         """
         query_filter = ProductAttributeFilterDict(**kwargs)
         return query_filter.querying(self)
 
+    def filter_by_attribute_values(self, attributes):
+        """
+        `filter_by_attribute` for `(<attribute code>, [<value>, ...])` pairs sent by clients,
+         see `ProductAttributeFilterDict.from_values`:
+            Product.objects.filter_by_attribute_values([("color", ["red"]), ("color", ["blue"])])
+        """
+        return ProductAttributeFilterDict.from_values(attributes).querying(self)
+
     def browsable(self):
         return self.filter(is_public=True)
 
+    def in_category(self, category, include_descendants=True):
+        """
+        Products linked to `category` or, with `include_descendants`, to any node of its subtree,
+         see `category_product_ids`.
+        """
+        return self.filter(pk__in=category_product_ids(category, include_descendants))
+
+    def with_attributes(self, language=None):
+        """
+        Loads the attribute values of all products with one extra query
+         and seeds each `product.attr` cache with them,
+         so `product.attr.get(<code>)` never hits the database.
+
+        - with `language`, the translations of the values and of their attributes
+         are prefetched too, restricted to that language and the default one.
+        """
+        AttributeValue = apps.get_model("products", "AttributeValue")
+        queryset = self.prefetch_related(
+            models.Prefetch(
+                "attribute_values",
+                queryset=annotate_attribute_values(AttributeValue.objects.all()),
+            )
+        )
+        if language is None:
+            return queryset
+        return queryset.prefetch_related(
+            translations_prefetch(
+                "attribute_values__translations",
+                apps.get_model("products", "AttributeValueTranslation"),
+                language,
+            ),
+            translations_prefetch(
+                "attribute_values__attribute__translations",
+                apps.get_model("products", "AttributeTranslation"),
+                language,
+            ),
+        )
+
+
+class ProductManager(models.Manager.from_queryset(ProductQuerySet)):
+    def facet_counts(self, queryset, attributes):
+        """
+        Number of products of `queryset` per value of each requested attribute:
+            Product.objects.facet_counts(products, attributes=["size", "color"])
+            {"size": [{"pk": 1, "value": "XL", "label": "XL", "count": 12}, ...], "color": [...]}
+
+        - computed by a single aggregation over the facet index,
+         values without any matching product are reported with count 0.
+        """
+        AttributeValue = apps.get_model("products", "AttributeValue")
+        rows = (
+            AttributeValue.objects.filter(attribute__slug__in=attributes)
+            .values("pk", "value", "label", code=models.F("attribute__slug"))
+            .annotate(
+                count=models.Count(
+                    "facets",
+                    filter=models.Q(facets__product__in=queryset.values("pk")),
+                )
+            )
+            .order_by("code", "normalized_numeric", "pk")
+        )
+        counts = {slug: [] for slug in attributes}
+        for row in rows:
+            counts[row.pop("code")].append(row)
+        return counts
+
+
+class AttributeValueManager(models.Manager):
+    """
+    Keeps `AttributeValue.normalized_numeric` in sync on bulk operations,
+     which bypass `AttributeValue.save`.
+    """
+
+    def _normalize(self, objs):
+        Attribute = apps.get_model("products", "Attribute")
+        attribute_ids = {obj.attribute_id for obj in objs if obj.numeric is not None}
+        units = dict(
+            Attribute.objects.filter(pk__in=attribute_ids).values_list("pk", "unit")
+        )
+        for obj in objs:
+            obj.normalize(units.get(obj.attribute_id) or "")
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self._normalize(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if "numeric" in fields:
+            self._normalize(objs)
+            fields = [*fields, "normalized_numeric"]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def renormalize(self, attribute):
+        """Recomputes normalised values of `attribute` in one UPDATE, e.g. after its unit changed."""
+        factor = CONVERSION_FACTORS.get(attribute.unit, 1.0) if attribute.unit else 1.0
+        return self.filter(attribute=attribute).update(
+            normalized_numeric=models.F("numeric") * factor
+        )
+
+
+class ProductAttributeFacetManager(models.Manager):
+    def matching_products(self, condition, attributes_count: int):
+        """
+        Ids of products which have a facet matching `condition`
+         for `attributes_count` distinct attributes (an intersection of
+         per-attribute product sets, computed in one GROUP BY pass).
+        """
+        return (
+            self.filter(condition)
+            .values("product_id")
+            .annotate(matched=models.Count("attribute_id", distinct=True))
+            .filter(matched=attributes_count)
+            .values("product_id")
+        )
+
+    def _build(self, assignments):
+        rows = assignments.values_list("product_id", "value__attribute_id", "value_id")
+        return [
+            self.model(product_id=product_id, attribute_id=attribute_id, value_id=value_id)
+            for product_id, attribute_id, value_id in rows.iterator()
+        ]
+
+    def sync_products(self, product_ids):
+        """Rebuilds the facet rows of the given products from their assigned values."""
+        AssignedProductAttributeValue = apps.get_model(
+            "products", "AssignedProductAttributeValue"
+        )
+        product_ids = list(product_ids)
+        with transaction.atomic():
+            self.filter(product_id__in=product_ids).delete()
+            self.bulk_create(
+                self._build(
+                    AssignedProductAttributeValue.objects.filter(
+                        product_id__in=product_ids
+                    )
+                ),
+                batch_size=1000,
+            )
+
+    def rebuild(self):
+        """
+        Rebuilds the whole index.
+
+        - bulk operations on AssignedProductAttributeValue don't send signals,
+         so run this (or `sync_products`) after them.
+        """
+        AssignedProductAttributeValue = apps.get_model(
+            "products", "AssignedProductAttributeValue"
+        )
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                self._build(AssignedProductAttributeValue.objects.all()),
+                batch_size=1000,
+            )
+
 
 class ProductClassManager(models.Manager):
+    """
+    DAG lookups are single indexed selects over
+     the closure table (see ProductClassClosure).
+    """
+
     def get_ancestor_ids(self, product_class_id: int):
         sql = """
-        WITH RECURSIVE ancestors AS (
-            SELECT
-                parent_id,
-                1 AS depth
-            FROM products_productclassedge
-            WHERE child_id = %s
-
-            UNION ALL
-
-            SELECT
-                edge.parent_id,
-                a.depth + 1
-            FROM products_productclassedge edge
-            INNER JOIN ancestors a
-                ON edge.child_id = a.parent_id
-        )
         SELECT
-            parent_id,
-            MIN(depth) AS depth
-        FROM ancestors
-        GROUP BY parent_id
-        ORDER BY depth ASC;
+            ancestor_id AS parent_id,
+            depth
+        FROM products_productclassclosure
+        WHERE descendant_id = %s AND depth > 0
+        ORDER BY depth ASC, ancestor_id ASC;
         """
 
         with connection.cursor() as cursor:
@@ -79,29 +331,14 @@ class ProductClassManager(models.Manager):
 
     def get_descendant_ids(self, product_class_id: int):
         sql = """
-            WITH RECURSIVE descendants AS (
-                SELECT
-                    child_id,
-                    1 AS depth
-                FROM products_productclassedge
-                WHERE parent_id = %s
-
-                UNION ALL
-
-                SELECT
-                    edge.child_id,
-                    d.depth + 1
-                FROM products_productclassedge edge
-                INNER JOIN descendants d
-                    ON edge.parent_id = d.child_id
-            )
-            SELECT
-                child_id,
-                MIN(depth) AS depth
-            FROM descendants
-            GROUP BY child_id
-            ORDER BY depth ASC;
-            """
+        SELECT
+            descendant_id AS child_id,
+            depth
+        FROM products_productclassclosure
+        WHERE ancestor_id = %s AND depth > 0
+        ORDER BY depth ASC, descendant_id ASC;
+        """
+
         with connection.cursor() as cursor:
             cursor.execute(sql, [product_class_id])
             columns = [col[0] for col in cursor.description]
@@ -114,26 +351,221 @@ class ProductClassManager(models.Manager):
         A cycle exists if child can already reach parent.
         """
         sql = """
-        WITH RECURSIVE descendants AS (
-            SELECT
-                child_id
-            FROM products_productclassedge
-            WHERE parent_id = %s
-
-            UNION
-
-            SELECT
-                edge.child_id
-            FROM products_productclassedge edge
-            INNER JOIN descendants d
-                ON edge.parent_id = d.child_id
-        )
         SELECT 1
-        FROM descendants
-        WHERE child_id = %s
+        FROM products_productclassclosure
+        WHERE ancestor_id = %s AND descendant_id = %s
         LIMIT 1;
         """
 
         with connection.cursor() as cursor:
             cursor.execute(sql, [child_id, parent_id])
             return cursor.fetchone() is not None
+
+
+class ProductClassEdgeManager(models.Manager):
+    def bulk_link(self, pairs, batch_size=1000):
+        """
+        Creates many parent -> child edges at once:
+            ProductClassEdge.objects.bulk_link([(parent, child), (parent_id, child_id), ...])
+
+        - the current graph is loaded once and checked together with the new edges
+         by a single in-memory topological sort; if a cycle appears nothing is created
+         and a ValidationError names the offending path.
+        - already existing edges are skipped.
+        """
+        ProductClass = apps.get_model("products", "ProductClass")
+        ProductClassClosure = apps.get_model("products", "ProductClassClosure")
+        ProductClassEffectiveAttribute = apps.get_model(
+            "products", "ProductClassEffectiveAttribute"
+        )
+
+        pairs = {
+            (getattr(parent, "pk", parent), getattr(child, "pk", child))
+            for parent, child in pairs
+        }
+        existing = set(self.values_list("parent_id", "child_id"))
+        new_pairs = sorted(pairs - existing)
+        if not new_pairs:
+            return []
+
+        children = defaultdict(list)
+        for parent_id, child_id in (*existing, *new_pairs):
+            children[parent_id].append(child_id)
+        _, cycle = topological_sort(children)
+        if cycle:
+            slugs = dict(
+                ProductClass.objects.filter(pk__in=cycle).values_list("pk", "slug")
+            )
+            raise ValidationError(
+                "These relations create a cycle: %s"
+                % " -> ".join(str(slugs.get(pk, pk)) for pk in cycle)
+            )
+
+        child_ids = {child_id for _, child_id in new_pairs}
+        with transaction.atomic():
+            edges = self.bulk_create(
+                [self.model(parent_id=parent_id, child_id=child_id) for parent_id, child_id in new_pairs],
+                batch_size=batch_size,
+            )
+            ProductClassClosure.objects.refresh_descendants(child_ids)
+            ProductClassEffectiveAttribute.objects.refresh_descendants(child_ids)
+            invalidate_product_class_graph()
+        return edges
+
+
+class ProductClassClosureManager(models.Manager):
+    def _edges(self):
+        ProductClassEdge = apps.get_model("products", "ProductClassEdge")
+        parents, children = defaultdict(list), defaultdict(list)
+        for parent_id, child_id in ProductClassEdge.objects.values_list(
+            "parent_id", "child_id"
+        ):
+            parents[child_id].append(parent_id)
+            children[parent_id].append(child_id)
+        return parents, children
+
+    @staticmethod
+    def _walk(graph, start):
+        """Shortest distance to every node reachable from `start` (itself excluded)."""
+        depths = {}
+        queue = deque([(start, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            for neighbour in graph.get(node, ()):
+                if neighbour != start and neighbour not in depths:
+                    depths[neighbour] = depth + 1
+                    queue.append((neighbour, depth + 1))
+        return depths
+
+    def _paths(self, parents, nodes):
+        return [
+            self.model(ancestor_id=ancestor_id, descendant_id=node, depth=depth)
+            for node in nodes
+            for ancestor_id, depth in self._walk(parents, node).items()
+        ]
+
+    def link(self, parent_id: int, child_id: int):
+        """
+        Adds the paths created by a new parent -> child edge:
+         every ancestor of parent reaches every descendant of child.
+        """
+        ancestors = dict(
+            self.filter(descendant_id=parent_id).values_list("ancestor_id", "depth")
+        )
+        descendants = dict(
+            self.filter(ancestor_id=child_id).values_list("descendant_id", "depth")
+        )
+        ancestors.setdefault(parent_id, 0)
+        descendants.setdefault(child_id, 0)
+        paths = {
+            (ancestor_id, descendant_id): ancestor_depth + descendant_depth + 1
+            for ancestor_id, ancestor_depth in ancestors.items()
+            for descendant_id, descendant_depth in descendants.items()
+        }
+
+        shortened = []
+        for row in self.filter(ancestor_id__in=ancestors, descendant_id__in=descendants):
+            depth = paths.pop((row.ancestor_id, row.descendant_id))
+            if depth < row.depth:
+                row.depth = depth
+                shortened.append(row)
+
+        with transaction.atomic():
+            self.bulk_update(shortened, fields=["depth"], batch_size=1000)
+            self.bulk_create(
+                [
+                    self.model(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth)
+                    for (ancestor_id, descendant_id), depth in paths.items()
+                ],
+                batch_size=1000,
+            )
+
+    def refresh_descendants(self, product_class_ids):
+        """
+        Recomputes the paths of the given classes and their descendants
+         from ProductClassEdge, e.g. after some of their incoming edges changed.
+        """
+        parents, children = self._edges()
+        nodes = set()
+        for product_class_id in product_class_ids:
+            nodes.add(product_class_id)
+            nodes.update(self._walk(children, product_class_id))
+        with transaction.atomic():
+            self.filter(descendant_id__in=nodes, depth__gt=0).delete()
+            self.bulk_create(self._paths(parents, nodes), batch_size=1000)
+
+    def unlink(self, child_id: int):
+        """
+        Recomputes the paths of child and its descendants after
+         one of child's incoming edges was removed.
+        """
+        self.refresh_descendants([child_id])
+
+    def rebuild(self):
+        """Rebuilds the whole closure from ProductClassEdge, e.g. after bulk operations."""
+        ProductClass = apps.get_model("products", "ProductClass")
+        parents, _ = self._edges()
+        nodes = list(ProductClass.objects.values_list("pk", flat=True))
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                [self.model(ancestor_id=node, descendant_id=node, depth=0) for node in nodes]
+                + self._paths(parents, nodes),
+                batch_size=1000,
+            )
+
+
+class ProductClassEffectiveAttributeManager(models.Manager):
+    def refresh(self, product_class_ids):
+        """
+        Recomputes the effective attributes of the given classes:
+         own attributes first, then those of the nearest ancestors,
+         each group in its AttributeProductClass order.
+        """
+        AttributeProductClass = apps.get_model("products", "AttributeProductClass")
+        product_class_ids = list(product_class_ids)
+        links = AttributeProductClass.objects.filter(
+            product_class__descendant_links__descendant__in=product_class_ids
+        ).values_list(
+            "product_class__descendant_links__descendant",
+            "product_class__descendant_links__depth",
+            "sort_order",
+            "pk",
+            "attribute_id",
+            "product_class_id",
+        )
+
+        resolved = defaultdict(dict)
+        for product_class_id, depth, sort_order, pk, attribute_id, source_id in sorted(
+            links, key=lambda row: (row[0], row[1], row[2] is None, row[2] or 0, row[3])
+        ):
+            resolved[product_class_id].setdefault(attribute_id, source_id)
+
+        with transaction.atomic():
+            self.filter(product_class_id__in=product_class_ids).delete()
+            self.bulk_create(
+                [
+                    self.model(
+                        product_class_id=product_class_id,
+                        attribute_id=attribute_id,
+                        source_id=source_id,
+                        sort_order=position,
+                    )
+                    for product_class_id, attributes in resolved.items()
+                    for position, (attribute_id, source_id) in enumerate(attributes.items())
+                ],
+                batch_size=1000,
+            )
+
+    def refresh_descendants(self, product_class_ids):
+        """Recomputes the effective attributes of the given classes and all of their descendants."""
+        ProductClassClosure = apps.get_model("products", "ProductClassClosure")
+        self.refresh(
+            ProductClassClosure.objects.filter(ancestor_id__in=product_class_ids)
+            .values_list("descendant_id", flat=True)
+            .distinct()
+        )
+
+    def rebuild(self):
+        ProductClass = apps.get_model("products", "ProductClass")
+        self.refresh(ProductClass.objects.values_list("pk", flat=True))
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.7 on 2026-10-18 20:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_facets(apps, schema_editor):
+    AssignedProductAttributeValue = apps.get_model("products", "AssignedProductAttributeValue")
+    ProductAttributeFacet = apps.get_model("products", "ProductAttributeFacet")
+    rows = AssignedProductAttributeValue.objects.values_list(
+        "product_id", "value__attribute_id", "value_id"
+    )
+    ProductAttributeFacet.objects.bulk_create(
+        [
+            ProductAttributeFacet(product_id=product_id, attribute_id=attribute_id, value_id=value_id)
+            for product_id, attribute_id, value_id in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_attribute_values'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductAttributeFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attribute', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facets', to='products.attribute')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facets', to='products.product')),
+                ('value', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facets', to='products.attributevalue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['attribute', 'value', 'product'], name='products_pr_attribu_1c7ccb_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'value'), name='unique_product_attribute_facet')],
+            },
+        ),
+        migrations.RunPython(populate_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-18 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_productattributefacet'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attributevalue',
+            index=models.Index(fields=['attribute', 'value'], name='products_at_attribu_599472_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attributevalue',
+            index=models.Index(fields=['attribute', 'numeric'], name='products_at_attribu_74a4fd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attributevalue',
+            index=models.Index(fields=['attribute', 'boolean'], name='products_at_attribu_22dd16_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attributevalue',
+            index=models.Index(fields=['attribute', 'date_time'], name='products_at_attribu_8e27c5_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.7 on 2026-10-18 20:39
+
+from django.db import migrations, models
+
+from products.units import CONVERSION_FACTORS
+
+
+def normalize_numeric_values(apps, schema_editor):
+    Attribute = apps.get_model("products", "Attribute")
+    AttributeValue = apps.get_model("products", "AttributeValue")
+    for attribute_id, unit in Attribute.objects.values_list("pk", "unit"):
+        factor = CONVERSION_FACTORS.get(unit, 1.0) if unit else 1.0
+        AttributeValue.objects.filter(attribute_id=attribute_id).update(
+            normalized_numeric=models.F("numeric") * factor
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_attributevalue_typed_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attributevalue',
+            name='products_at_attribu_74a4fd_idx',
+        ),
+        migrations.AddField(
+            model_name='attributevalue',
+            name='normalized_numeric',
+            field=models.FloatField(blank=True, editable=False, help_text="Numeric value converted to the base unit of the attribute unit's dimension.", null=True),
+        ),
+        migrations.AddIndex(
+            model_name='attributevalue',
+            index=models.Index(fields=['attribute', 'normalized_numeric'], name='products_at_attribu_b09659_idx'),
+        ),
+        migrations.RunPython(normalize_numeric_values, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.7 on 2026-10-18 20:41
+
+from collections import defaultdict, deque
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_closure(apps, schema_editor):
+    ProductClass = apps.get_model("products", "ProductClass")
+    ProductClassEdge = apps.get_model("products", "ProductClassEdge")
+    ProductClassClosure = apps.get_model("products", "ProductClassClosure")
+
+    parents = defaultdict(list)
+    for parent_id, child_id in ProductClassEdge.objects.values_list("parent_id", "child_id"):
+        parents[child_id].append(parent_id)
+
+    rows = []
+    for node in ProductClass.objects.values_list("pk", flat=True):
+        depths = {node: 0}
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            for parent_id in parents[current]:
+                if parent_id not in depths:
+                    depths[parent_id] = depths[current] + 1
+                    queue.append(parent_id)
+        rows.extend(
+            ProductClassClosure(ancestor_id=ancestor_id, descendant_id=node, depth=depth)
+            for ancestor_id, depth in depths.items()
+        )
+    ProductClassClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_attributevalue_normalized_numeric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductClassClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(default=0)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='products.productclass')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='products.productclass')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='products_pr_descend_126ec0_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='unique_product_class_closure')],
+            },
+        ),
+        migrations.RunPython(populate_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.7 on 2026-10-18 21:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_effective_attributes(apps, schema_editor):
+    ProductClassClosure = apps.get_model("products", "ProductClassClosure")
+    AttributeProductClass = apps.get_model("products", "AttributeProductClass")
+    ProductClassEffectiveAttribute = apps.get_model("products", "ProductClassEffectiveAttribute")
+
+    assignments = {}
+    for pk, product_class_id, attribute_id, sort_order in AttributeProductClass.objects.values_list(
+        "pk", "product_class_id", "attribute_id", "sort_order"
+    ):
+        assignments.setdefault(product_class_id, []).append((sort_order is None, sort_order or 0, pk, attribute_id))
+
+    links = {}
+    for ancestor_id, descendant_id, depth in ProductClassClosure.objects.values_list(
+        "ancestor_id", "descendant_id", "depth"
+    ):
+        for sort_key in assignments.get(ancestor_id, ()):
+            links.setdefault(descendant_id, []).append((depth, *sort_key, ancestor_id))
+
+    rows = []
+    for product_class_id, candidates in links.items():
+        resolved = {}
+        for *_, attribute_id, source_id in sorted(candidates):
+            resolved.setdefault(attribute_id, source_id)
+        rows.extend(
+            ProductClassEffectiveAttribute(
+                product_class_id=product_class_id,
+                attribute_id=attribute_id,
+                source_id=source_id,
+                sort_order=position,
+            )
+            for position, (attribute_id, source_id) in enumerate(resolved.items())
+        )
+    ProductClassEffectiveAttribute.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_productclassclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductClassEffectiveAttribute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sort_order', models.PositiveIntegerField(default=0)),
+                ('attribute', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_product_classes', to='products.attribute')),
+                ('product_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_attributes', to='products.productclass')),
+                ('source', models.ForeignKey(help_text='The class this attribute is assigned to.', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='products.productclass')),
+            ],
+            options={
+                'ordering': ('product_class', 'sort_order'),
+                'indexes': [models.Index(fields=['product_class', 'sort_order'], name='products_pr_product_360cfb_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product_class', 'attribute'), name='unique_product_class_effective_attribute')],
+            },
+        ),
+        migrations.RunPython(populate_effective_attributes, migrations.RunPython.noop),
+    ]
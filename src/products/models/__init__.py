@@ -1,5 +1,11 @@
 from .attributes import Attribute, AttributeTranslation
-from .classes import ProductClass, ProductClassEdge
+from .classes import (
+    ProductClass,
+    ProductClassClosure,
+    ProductClassEdge,
+    ProductClassEffectiveAttribute,
+)
+from .facets import ProductAttributeFacet
 from .products import Product, ProductMedia, ProductTranslation
 from .values import AttributeValue, AttributeValueTranslation
 from .variants import (
@@ -19,8 +25,11 @@ __all__ = [
     "AttributeValueTranslation",
     "AttributeVariant",
     "Product",
+    "ProductAttributeFacet",
     "ProductClass",
+    "ProductClassClosure",
     "ProductClassEdge",
+    "ProductClassEffectiveAttribute",
     "ProductMedia",
     "ProductTranslation",
     "ProductVariant",
@@ -1,8 +1,14 @@
+import datetime
+import math
+
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from utils.models import ModelWithMetadata, SortableModel, TranslationModel
 
-from ..units import MeasurementUnits
+from ..units import MeasurementUnits, to_base_unit
 
 
 class AttributeInputType(models.TextChoices):
@@ -45,6 +51,14 @@ class AttributeInputType(models.TextChoices):
     """Stores a date and time value."""
 
 
+ATTRIBUTE_VALUE_FIELDS = {
+    AttributeInputType.NUMERIC: "normalized_numeric",
+    AttributeInputType.BOOLEAN: "boolean",
+    AttributeInputType.DATE: "date_time",
+    AttributeInputType.DATE_TIME: "date_time",
+}
+
+
 class Attribute(ModelWithMetadata):
     product_class = models.ManyToManyField(
         "products.ProductClass",
@@ -72,6 +86,69 @@ class Attribute(ModelWithMetadata):
     def has_values(self):
         return self.values.exists()
 
+    @property
+    def value_field(self) -> str:
+        """The typed column of AttributeValue which holds values of this attribute."""
+        return ATTRIBUTE_VALUE_FIELDS.get(self.input_type, "value")
+
+    def prepare_filter_value(self, value):
+        """
+        Converts a filter value to what is stored in the `value_field` column:
+            - numbers are given in the attribute unit and compared in the base unit.
+            - dates are compared against the `date_time` column as aware midnights.
+            - booleans also accept "true"/"false" (and "1"/"0") strings.
+        Raises ValidationError when the value can't be read as the attribute type.
+        """
+        if isinstance(value, (list, tuple, set)):
+            return [self.prepare_filter_value(v) for v in value]
+        if value is None or isinstance(value, bool):
+            # `isnull` lookups and boolean attributes
+            return value
+        if self.input_type == AttributeInputType.NUMERIC:
+            return to_base_unit(self._parse_number(value), self.unit)
+        if self.input_type in (AttributeInputType.DATE, AttributeInputType.DATE_TIME):
+            return self._parse_datetime(value)
+        if self.input_type == AttributeInputType.BOOLEAN:
+            return self._parse_boolean(value)
+        return value
+
+    def _invalid_filter_value(self, value, expected):
+        # formatted here, GraphQL errors show the raw message of the exception
+        return ValidationError(
+            "%r is not a valid %s for the %s attribute." % (value, expected, self.slug),
+            code="invalid",
+        )
+
+    def _parse_number(self, value) -> float:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise self._invalid_filter_value(value, "number") from None
+        if not math.isfinite(number):
+            raise self._invalid_filter_value(value, "number")
+        return number
+
+    def _parse_datetime(self, value) -> datetime.datetime:
+        parsed = value
+        if isinstance(value, str):
+            try:
+                parsed = parse_datetime(value) or parse_date(value)
+            except ValueError:
+                parsed = None
+        if isinstance(parsed, datetime.datetime):
+            return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+        if isinstance(parsed, datetime.date):
+            return timezone.make_aware(datetime.datetime.combine(parsed, datetime.time.min))
+        raise self._invalid_filter_value(value, "date")
+
+    def _parse_boolean(self, value) -> bool:
+        normalized = str(value).strip().lower()
+        if normalized in ("true", "1"):
+            return True
+        if normalized in ("false", "0"):
+            return False
+        raise self._invalid_filter_value(value, "boolean")
+
 
 class AttributeTranslation(TranslationModel):
     attribute = models.ForeignKey(
@@ -4,6 +4,7 @@ from django.db import models
 from utils.models import ModelWithMetadata
 
 from .. import managers
+from ..graph import get_product_class_graph
 
 
 class ProductClass(ModelWithMetadata):
@@ -47,30 +48,21 @@ class ProductClass(ModelWithMetadata):
         return f"<{type(self).__name__}> obj {self.title or self.slug}"
 
     def get_ancestors(self, include_self=False):
-        rows = ProductClass.objects.get_ancestor_ids(self.pk)
-        ordered_ids = [row["parent_id"] for row in rows]
-        if include_self:
-            ordered_ids = [self.pk] + ordered_ids
-        preserved = models.Case(
-            *[models.When(pk=pk, then=pos) for pos, pk in enumerate(ordered_ids)]
-        )
-        return ProductClass.objects.filter(pk__in=ordered_ids).order_by(preserved)
+        """Ancestors nearest first, answered from the in-process graph snapshot."""
+        return get_product_class_graph().get_ancestors(self.pk, include_self)
 
     def get_descendants(self, include_self=False):
-        rows = ProductClass.objects.get_descendant_ids(self.pk)
-        ordered_ids = [row["child_id"] for row in rows]
-        if include_self:
-            ordered_ids = [self.pk] + ordered_ids
-        preserved = models.Case(
-            *[models.When(pk=pk, then=pos) for pos, pk in enumerate(ordered_ids)]
-        )
-        return ProductClass.objects.filter(pk__in=ordered_ids).order_by(preserved)
+        """Descendants nearest first, answered from the in-process graph snapshot."""
+        return get_product_class_graph().get_descendants(self.pk, include_self)
 
     def get_attributes(self, **filters):
-        attributes = self.attributes.model.objects.filter(
-            product_class__in=self.get_ancestors(include_self=True), **filters
-        ).distinct()
-        return attributes
+        """
+        Own and inherited attributes, in their resolved order
+         (materialised in ProductClassEffectiveAttribute).
+        """
+        return self.attributes.model.objects.filter(
+            effective_product_classes__product_class=self, **filters
+        ).order_by("effective_product_classes__sort_order")
 
 
 class ProductClassEdge(models.Model):
@@ -94,6 +86,8 @@ class ProductClassEdge(models.Model):
         help_text="The class receiving inheritance.",
     )
 
+    objects = managers.ProductClassEdgeManager()
+
     class Meta:
         constraints = [  # noqa: RUF012
             models.UniqueConstraint(
@@ -123,3 +117,84 @@ class ProductClassEdge(models.Model):
             raise ValidationError("A ProductClass cannot inherit from itself.")
         if ProductClass.objects.check_cycle(parent_id, child_id):
             raise ValidationError("This relation creates a cycle.")
+
+
+class ProductClassClosure(models.Model):
+    """
+    Transitive closure of the ProductClass DAG.
+
+    Holds one row per (ancestor, descendant) pair connected through ProductClassEdge,
+     with the length of the shortest path between them; every class is also its own
+     ancestor at depth 0. Rows are maintained incrementally by the signal handlers
+     in `products.signals`.
+    """
+
+    ancestor = models.ForeignKey(
+        "products.ProductClass",
+        on_delete=models.CASCADE,
+        related_name="descendant_links",
+    )
+    descendant = models.ForeignKey(
+        "products.ProductClass",
+        on_delete=models.CASCADE,
+        related_name="ancestor_links",
+    )
+    depth = models.PositiveIntegerField(default=0)
+
+    objects = managers.ProductClassClosureManager()
+
+    class Meta:
+        constraints = [  # noqa: RUF012
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="unique_product_class_closure",
+            ),
+        ]
+        indexes = (models.Index(fields=["descendant", "depth"]),)
+        app_label = "products"
+
+    def __str__(self):
+        return f"{self.descendant_id} --{self.depth}--> {self.ancestor_id}"
+
+
+class ProductClassEffectiveAttribute(models.Model):
+    """
+    Attributes of a ProductClass including the inherited ones, in their resolved order.
+
+    Recomputed for the affected classes by the signal handlers in `products.signals`
+     whenever an edge or an attribute assignment of an ancestor changes.
+    """
+
+    product_class = models.ForeignKey(
+        "products.ProductClass",
+        on_delete=models.CASCADE,
+        related_name="effective_attributes",
+    )
+    attribute = models.ForeignKey(
+        "products.Attribute",
+        on_delete=models.CASCADE,
+        related_name="effective_product_classes",
+    )
+    source = models.ForeignKey(
+        "products.ProductClass",
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="The class this attribute is assigned to.",
+    )
+    sort_order = models.PositiveIntegerField(default=0)
+
+    objects = managers.ProductClassEffectiveAttributeManager()
+
+    class Meta:
+        constraints = [  # noqa: RUF012
+            models.UniqueConstraint(
+                fields=["product_class", "attribute"],
+                name="unique_product_class_effective_attribute",
+            ),
+        ]
+        indexes = (models.Index(fields=["product_class", "sort_order"]),)
+        ordering = ("product_class", "sort_order")
+        app_label = "products"
+
+    def __str__(self):
+        return f"{self.product_class_id}: {self.attribute_id}"
@@ -0,0 +1,41 @@
+from django.db import models
+
+from .. import managers
+
+
+class ProductAttributeFacet(models.Model):
+    """
+    Denormalised (product, attribute, value) index used for attribute filtering.
+
+    Each row mirrors an AssignedProductAttributeValue together with the attribute
+     of the assigned value, so filtering by several attributes becomes a single
+     grouped scan over this table instead of one join per attribute.
+    Rows are kept in sync by the signal handlers in `products.signals`.
+    """
+
+    product = models.ForeignKey(
+        "products.Product", on_delete=models.CASCADE, related_name="facets"
+    )
+    attribute = models.ForeignKey(
+        "products.Attribute", on_delete=models.CASCADE, related_name="facets"
+    )
+    value = models.ForeignKey(
+        "products.AttributeValue", on_delete=models.CASCADE, related_name="facets"
+    )
+
+    objects = managers.ProductAttributeFacetManager()
+
+    class Meta:
+        app_label = "products"
+        constraints = [  # noqa: RUF012
+            models.UniqueConstraint(
+                fields=["product", "value"],
+                name="unique_product_attribute_facet",
+            ),
+        ]
+        indexes = (
+            models.Index(fields=["attribute", "value", "product"]),
+        )
+
+    def __str__(self):
+        return f"{self.product_id}: {self.attribute_id} = {self.value_id}"
@@ -1,5 +1,6 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils.functional import cached_property
 
 from utils.models import (
     BaseSeoModel,
@@ -45,16 +46,18 @@ class Product(BaseSeoModel, ModelWithDescription):
         app_label = "products"
         ordering = ("-updated_at",)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.attr = ProductAttributeContainer(self)
-
     def __str__(self):
         return self.title or self.slug
 
     def __repr__(self):
         return f"<{type(self).__name__}> obj {self.title or self.slug}"
 
+    @cached_property
+    def attr(self) -> ProductAttributeContainer:
+        # Attached on first access, so materialising products
+        #  which never touch their attributes allocates nothing extra.
+        return ProductAttributeContainer(self)
+
     def clean(self):
         super().clean()
         if self.product_type_id and self.product_type.abstract:
@@ -66,7 +69,8 @@ class Product(BaseSeoModel, ModelWithDescription):
 
     def refresh_from_db(self, using=None, fields=None, from_queryset=None):
         result = super().refresh_from_db(using, fields, from_queryset)
-        self.attr.invalidate()
+        if "attr" in self.__dict__:
+            self.attr.invalidate()
         return result
 
 
@@ -1,7 +1,12 @@
 from django.db import models
+from django.utils import timezone
 
 from utils.models import SortableModel, TranslationModel
 
+from .. import managers
+from ..units import to_base_unit
+from .attributes import AttributeInputType
+
 
 class AssignedProductAttributeValue(SortableModel):
     product = models.ForeignKey(
@@ -40,6 +45,12 @@ class AttributeValue(models.Model):
     boolean = models.BooleanField(blank=True, null=True)
     date_time = models.DateTimeField(blank=True, null=True)
     numeric = models.FloatField(blank=True, null=True)
+    normalized_numeric = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Numeric value converted to the base unit of the attribute unit's dimension.",
+    )
 
     reference_product = models.ForeignKey(
         "products.Product",
@@ -64,13 +75,51 @@ class AttributeValue(models.Model):
         null=True,
     )
 
+    objects = managers.AttributeValueManager()
+
     class Meta:
         unique_together = (("label", "attribute"),)
+        indexes = (
+            models.Index(fields=["attribute", "value"]),
+            models.Index(fields=["attribute", "normalized_numeric"]),
+            models.Index(fields=["attribute", "boolean"]),
+            models.Index(fields=["attribute", "date_time"]),
+        )
 
     @property
     def data_type(self):
         return self.attribute.data_type
 
+    @property
+    def typed_value(self):
+        """
+        The value in the column of its attribute's input type: a number (in the attribute unit),
+         a boolean, a date, a datetime, or the `value` text for the other input types.
+        """
+        input_type = self.attribute.input_type
+        if input_type == AttributeInputType.NUMERIC:
+            return self.numeric
+        if input_type == AttributeInputType.BOOLEAN:
+            return self.boolean
+        if input_type == AttributeInputType.DATE:
+            return timezone.localdate(self.date_time) if self.date_time is not None else None
+        if input_type == AttributeInputType.DATE_TIME:
+            return self.date_time
+        return self.value
+
+    def normalize(self, unit=None):
+        """Fills `normalized_numeric`, `unit` defaults to the unit of the attribute."""
+        if unit is None and self.numeric is not None:
+            unit = self.attribute.unit
+        self.normalized_numeric = to_base_unit(self.numeric, unit)
+
+    def save(self, *args, **kwargs):
+        self.normalize()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "numeric" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "normalized_numeric"}
+        super().save(*args, **kwargs)
+
 
 class AttributeValueTranslation(TranslationModel):
     attribute_value = models.ForeignKey(
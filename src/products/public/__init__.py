@@ -0,0 +1,4 @@
+from .queries import ProductQuery as ProductsQuery
+
+
+__all__ = ["ProductsQuery"]
@@ -0,0 +1,44 @@
+import strawberry
+import strawberry_django
+from django.db.models import QuerySet
+
+from catalogue.tree import TREE_RESPONSE_TAG, get_category_tree
+from utils.relay import CursorConnection
+from utils.response_cache import cache_hint
+
+from .. import models
+from ..graphql_types import AttributeFilterInput
+from .types import ProductType
+
+
+@strawberry.type
+class ProductQuery:
+    @strawberry_django.connection(
+        CursorConnection[ProductType], max_results=20, metadata=cache_hint(tags=[TREE_RESPONSE_TAG])
+    )
+    def products(
+        self,
+        category: str | None = None,
+        include_descendants: bool = True,
+        attributes: list[AttributeFilterInput] | None = None,
+    ) -> QuerySet[models.Product]:
+        """
+        Public products, optionally of the browsable category with the `category` full slug
+         (and its subtree) and having one of the `values` of every filtered attribute.
+        """
+        # non-public products are excluded by ProductType.get_queryset
+        queryset = models.Product.objects.all()
+        if category is not None:
+            node = get_category_tree().get_by_full_slug(category)
+            if node is None or not node.is_browsable:
+                return queryset.none()
+            queryset = queryset.in_category(node, include_descendants=include_descendants)
+        if attributes:
+            queryset = queryset.filter_by_attribute_values(
+                (item.attribute, item.values) for item in attributes
+            )
+        return queryset
+
+    @strawberry_django.field(description="Public product by its slug")
+    def product(self, slug: str) -> ProductType | None:
+        return models.Product.objects.filter(slug=slug)
@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING, Annotated, Optional
+
+import strawberry
+import strawberry_django
+from strawberry import auto, lazy
+from strawberry.relay import Node
+from strawberry.types import Info
+
+from utils.translations import prefetch_translations, resolve_translation
+from utils.types import BaseSeoModelType, TranslationModelType
+
+from .. import models
+from ..graphql_types import ProductAttributeType, attribute_values_prefetch, resolve_attributes
+
+if TYPE_CHECKING:
+    from catalogue.public.types import CategoryType
+
+
+@strawberry_django.type(models.ProductTranslation)
+class ProductTranslateType(TranslationModelType):
+    title: auto
+    description: auto
+
+
+@strawberry_django.type(models.Product)
+class ProductType(Node, BaseSeoModelType):
+    title: auto
+    slug: auto
+    description: auto
+    created_at: auto
+    # only browsable categories, see CategoryType.get_queryset
+    categories: list[Annotated["CategoryType", lazy("catalogue.public.types")]]
+
+    @classmethod
+    def get_queryset(cls, queryset, info: Info, **kwargs):
+        return queryset.filter(is_public=True)
+
+    @strawberry_django.field(
+        description="Attribute values of this product",
+        prefetch_related=[attribute_values_prefetch()],
+    )
+    def attributes(self) -> list[ProductAttributeType]:
+        return resolve_attributes(self)
+
+    @strawberry_django.field(
+        description="Translation in the requested language, falling back to the default one",
+        prefetch_related=[
+            prefetch_translations(models.ProductTranslation, to_attr="fallback_translations")
+        ],
+    )
+    def translation(
+        self, info: Info, language: str | None = None
+    ) -> Optional[ProductTranslateType]:
+        return resolve_translation(self, info, language, to_attr="fallback_translations")
@@ -0,0 +1,117 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from utils.response_cache import invalidate_instance
+
+from . import models
+from .graph import invalidate_product_class_graph
+from .models.attributes import AttributeProductClass
+from .models.values import AssignedProductAttributeValue
+
+
+@receiver(post_save, sender=AssignedProductAttributeValue)
+def sync_facet_on_assignment_save(sender, instance, **kwargs):
+    models.ProductAttributeFacet.objects.sync_products([instance.product_id])
+
+
+@receiver(post_delete, sender=AssignedProductAttributeValue)
+def delete_facet_on_assignment_delete(sender, instance, **kwargs):
+    models.ProductAttributeFacet.objects.filter(
+        product_id=instance.product_id, value_id=instance.value_id
+    ).delete()
+
+
+@receiver(m2m_changed, sender=models.Product.attribute_values.through)
+def sync_facets_on_attribute_values_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        models.ProductAttributeFacet.objects.sync_products([instance.pk])
+    elif action == "post_clear":
+        models.ProductAttributeFacet.objects.filter(value_id=instance.pk).delete()
+    else:
+        models.ProductAttributeFacet.objects.sync_products(pk_set)
+
+
+@receiver(post_save, sender=models.AttributeValue)
+def sync_facet_attribute_on_value_save(sender, instance, created, **kwargs):
+    if not created:
+        models.ProductAttributeFacet.objects.filter(value_id=instance.pk).exclude(
+            attribute_id=instance.attribute_id
+        ).update(attribute_id=instance.attribute_id)
+
+
+def _saves_unit(update_fields):
+    return update_fields is None or "unit" in update_fields
+
+
+@receiver(pre_save, sender=models.Attribute)
+def remember_attribute_unit(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is not None and _saves_unit(update_fields):
+        instance._stored_unit = (
+            sender.objects.filter(pk=instance.pk).values_list("unit", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=models.Attribute)
+def renormalize_values_on_attribute_save(sender, instance, created, update_fields=None, **kwargs):
+    stored_unit = instance.__dict__.pop("_stored_unit", None)
+    if not created and _saves_unit(update_fields) and stored_unit != instance.unit:
+        models.AttributeValue.objects.renormalize(instance)
+
+
+@receiver(post_save, sender=models.ProductClass)
+def add_product_class_closure(sender, instance, created, **kwargs):
+    if created:
+        models.ProductClassClosure.objects.create(
+            ancestor=instance, descendant=instance, depth=0
+        )
+
+
+@receiver(post_save, sender=models.ProductClassEdge)
+def link_product_class_closure(sender, instance, created, **kwargs):
+    if created:
+        models.ProductClassClosure.objects.link(instance.parent_id, instance.child_id)
+        models.ProductClassEffectiveAttribute.objects.refresh_descendants(
+            [instance.child_id]
+        )
+    else:
+        models.ProductClassClosure.objects.rebuild()
+        models.ProductClassEffectiveAttribute.objects.rebuild()
+
+
+@receiver(post_delete, sender=models.ProductClassEdge)
+def unlink_product_class_closure(sender, instance, **kwargs):
+    models.ProductClassClosure.objects.unlink(instance.child_id)
+    models.ProductClassEffectiveAttribute.objects.refresh_descendants([instance.child_id])
+
+
+@receiver(post_save, sender=AttributeProductClass)
+@receiver(post_delete, sender=AttributeProductClass)
+def refresh_effective_attributes(sender, instance, **kwargs):
+    models.ProductClassEffectiveAttribute.objects.refresh_descendants(
+        [instance.product_class_id]
+    )
+
+
+@receiver(post_save, sender=models.ProductClass)
+@receiver(post_delete, sender=models.ProductClass)
+@receiver(post_save, sender=models.ProductClassEdge)
+@receiver(post_delete, sender=models.ProductClassEdge)
+def invalidate_product_class_graph_on_change(sender, **kwargs):
+    invalidate_product_class_graph()
+
+
+@receiver(post_save, sender=models.Product)
+@receiver(post_delete, sender=models.Product)
+@receiver(post_save, sender=models.ProductClass)
+@receiver(post_delete, sender=models.ProductClass)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    invalidate_instance(sender, instance.pk)
+
+
+@receiver(post_save, sender=models.ProductTranslation)
+@receiver(post_delete, sender=models.ProductTranslation)
+def invalidate_cached_product_responses(sender, instance, **kwargs):
+    invalidate_instance(models.Product, instance.product_id)
@@ -35,3 +35,36 @@ MeasurementUnits: type[Enum] = models.TextChoices(
         for m in e
     ],
 )
+
+
+CONVERSION_FACTORS = {
+    # Distance -> meter
+    DistanceUnits.MM: 0.001,
+    DistanceUnits.CM: 0.01,
+    DistanceUnits.DM: 0.1,
+    DistanceUnits.M: 1.0,
+    DistanceUnits.KM: 1000.0,
+    DistanceUnits.INCH: 0.0254,
+    # Weight -> kilogram
+    WeightUnits.G: 0.001,
+    WeightUnits.LB: 0.45359237,
+    WeightUnits.OZ: 0.028349523125,
+    WeightUnits.KG: 1.0,
+    # Area -> square meter
+    AreaUnits.SQ_MM: 0.000001,
+    AreaUnits.SQ_CM: 0.0001,
+    AreaUnits.SQ_DM: 0.01,
+    AreaUnits.SQ_M: 1.0,
+    AreaUnits.SQ_INCH: 0.00064516,
+}
+"""Factor which converts a value of each unit to the base unit of its dimension."""
+
+
+def to_base_unit(value, unit):
+    """
+    Converts `value` measured in `unit` to the base unit of its dimension.
+     values without a unit are returned as they are.
+    """
+    if value is None or not unit:
+        return value
+    return value * CONVERSION_FACTORS[unit]
@@ -0,0 +1,16 @@
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+
+def get_dataloader(info: Info, load_fn) -> DataLoader:
+    """
+    Returns the DataLoader of `load_fn` for the running request,
+     so every resolver of one operation shares the same batches and cache.
+    """
+    loaders = getattr(info.context, "_dataloaders", None)
+    if loaders is None:
+        loaders = {}
+        setattr(info.context, "_dataloaders", loaders)
+    if load_fn not in loaders:
+        loaders[load_fn] = DataLoader(load_fn=load_fn)
+    return loaders[load_fn]
@@ -0,0 +1,106 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+
+from django.core.cache import cache
+from graphql import GraphQLError
+from strawberry.extensions import SchemaExtension
+
+QUERY_CACHE_KEY = "graphql:persisted-query:%s"
+QUERY_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+class DocumentCache:
+    """Bounded LRU of validated documents, shared by every request of this process."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+            return document
+
+    def set(self, key, document):
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+
+documents = DocumentCache(maxsize=1000)
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class PersistedQueries(SchemaExtension):
+    """
+    Automatic persisted queries, following the Apollo APQ protocol.
+
+    A client sends `extensions.persistedQuery.sha256Hash` instead of the query:
+     - a known hash is served from the parsed & validated documents of this process,
+       or from the query text kept in the shared cache (parsed and validated once per process);
+     - an unknown hash answers `PersistedQueryNotFound`, the client then retries with
+       both the query and its hash and the query is registered once it validates.
+    Plain queries are keyed by their own hash, so they skip parse and validation too,
+     apart from the validation rules flagged with `validates_variables`.
+    """
+
+    def on_operation(self) -> Iterator[None]:
+        context = self.execution_context
+        persisted = (context.operation_extensions or {}).get("persistedQuery") or {}
+        sha256 = persisted.get("sha256Hash")
+        self.key = self.register = None
+        self.cached = False
+
+        if context.query is None:
+            if not sha256:
+                yield
+                return
+            self.key = (id(context.schema), sha256)
+            context.graphql_document = documents.get(self.key)
+            if context.graphql_document is None:
+                context.query = cache.get(QUERY_CACHE_KEY % sha256)
+                if context.query is None:
+                    raise GraphQLError(
+                        "PersistedQueryNotFound",
+                        extensions={"code": "PERSISTED_QUERY_NOT_FOUND"},
+                    )
+        else:
+            if sha256 and sha256 != query_hash(context.query):
+                raise GraphQLError(
+                    "provided sha does not match query",
+                    extensions={"code": "INVALID_SHA256"},
+                )
+            self.key = (id(context.schema), sha256 or query_hash(context.query))
+            context.graphql_document = documents.get(self.key)
+            self.register = sha256
+        self.cached = context.graphql_document is not None
+        yield
+
+    def on_validate(self) -> Iterator[None]:
+        context = self.execution_context
+        if self.cached and context.pre_execution_errors is None:
+            # documents are stored only after they passed validation,
+            #  only rules checking the variables of this request (`validates_variables`) run again
+            context.validation_rules = tuple(
+                rule for rule in context.validation_rules if getattr(rule, "validates_variables", False)
+            )
+        yield
+        if self.key is None or self.cached or context.pre_execution_errors:
+            return
+        documents.set(self.key, context.graphql_document)
+        if self.register:
+            cache.set(QUERY_CACHE_KEY % self.register, context.query, timeout=QUERY_CACHE_TIMEOUT)
@@ -0,0 +1,178 @@
+from collections.abc import Iterator
+
+from django.conf import settings
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    ValidationContext,
+    ValidationRule,
+    get_named_type,
+    get_nullable_type,
+    is_leaf_type,
+    is_list_type,
+)
+from graphql.language import IntValueNode, VariableNode
+from strawberry.extensions import SchemaExtension
+from strawberry.relay.fields import ConnectionExtension
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+
+COST_WEIGHT = "cost_weight"
+
+
+def cost_hint(weight: int) -> dict:
+    """
+    Field metadata pricing its resolver at `weight` instead of the flat `object_cost`,
+     scalars included: `strawberry_django.field(metadata=cost_hint(20))`.
+    Combine it with other hints by merging the dicts.
+    """
+    return {COST_WEIGHT: weight}
+
+
+class QueryCost(SchemaExtension):
+    """
+    Estimates the cost of an operation before it runs and rejects it above the budget.
+
+    Every object field costs `object_cost` and scalars are free, unless the field carries
+     a `cost_hint`; introspection fields (`__schema`, `__type`) cost a flat `object_cost`,
+     whatever they select. The cost of a field's selection is multiplied by the page it may return: `first`/`last` of connections
+     (`default_page_size` when omitted, capped by the connection's `max_results`)
+     or `default_page_size` for plain lists.
+    The estimate runs as a validation rule on the graphql-core schema and
+     is returned in the `cost` response extension.
+    """
+
+    def __init__(self, max_cost=None, default_page_size=10, object_cost=1):
+        self.max_cost = settings.GRAPHQL_MAX_QUERY_COST if max_cost is None else max_cost
+        self.default_page_size = default_page_size
+        self.object_cost = object_cost
+        self.cost = None
+
+    def on_operation(self) -> Iterator[None]:
+        extension = self
+
+        class QueryCostRule(ValidationRule):
+            # the page sizes come from the variables, so it runs for persisted documents too
+            validates_variables = True
+
+            def enter_document(self, node, *args):
+                extension.estimate(self.context)
+                return self.SKIP
+
+        self.execution_context.validation_rules = (
+            *self.execution_context.validation_rules, QueryCostRule,
+        )
+        yield
+
+    def estimate(self, validation: ValidationContext):
+        """Costs the executed operation, a validation error above the budget keeps it from running."""
+        operation = self._get_operation()
+        if operation is None:
+            return
+        self.validation = validation
+        root = validation.schema.get_root_type(operation.operation)
+        self.cost = self.selection_cost(operation.selection_set, root, set())
+        if self.cost > self.max_cost:
+            validation.report_error(
+                GraphQLError(
+                    "Query cost %d exceeds the maximum cost of %d." % (self.cost, self.max_cost),
+                    extensions={"code": "QUERY_TOO_EXPENSIVE"},
+                )
+            )
+
+    def get_results(self) -> dict:
+        if self.cost is None:
+            return {}
+        return {"cost": {"requested": self.cost, "maximum": self.max_cost}}
+
+    def _get_operation(self):
+        context = self.execution_context
+        operations = [
+            definition
+            for definition in context.graphql_document.definitions
+            if isinstance(definition, OperationDefinitionNode)
+        ]
+        if context.operation_name:
+            operations = [
+                operation for operation in operations
+                if operation.name and operation.name.value == context.operation_name
+            ]
+        return operations[0] if len(operations) == 1 else None
+
+    def _max_results(self, definition) -> int:
+        field = definition.extensions.get(GraphQLCoreConverter.DEFINITION_BACKREF)
+        for extension in getattr(field, "extensions", ()):
+            if isinstance(extension, ConnectionExtension) and extension.max_results is not None:
+                return extension.max_results
+        return self.execution_context.schema.config.relay_max_results
+
+    def _weight(self, definition) -> int | None:
+        field = definition.extensions.get(GraphQLCoreConverter.DEFINITION_BACKREF)
+        metadata = getattr(field, "metadata", None) or {}
+        return metadata.get(COST_WEIGHT)
+
+    def _page_size(self, field: FieldNode, definition) -> int:
+        if get_named_type(definition.type).name.endswith("Connection"):
+            max_results = self._max_results(definition)
+        elif is_list_type(get_nullable_type(definition.type)):
+            max_results = None
+        else:
+            return 1
+
+        page_size = self.default_page_size
+        variables = self.execution_context.variables or {}
+        for argument in field.arguments or ():
+            if argument.name.value not in ("first", "last"):
+                continue
+            if isinstance(argument.value, IntValueNode):
+                page_size = int(argument.value.value)
+            elif isinstance(argument.value, VariableNode):
+                value = variables.get(argument.value.name.value)
+                if isinstance(value, int):
+                    page_size = value
+            break
+        page_size = max(page_size, 0)
+        return page_size if max_results is None else min(page_size, max_results)
+
+    def selection_cost(self, selection_set, parent_type, visited: set) -> int:
+        if selection_set is None or not hasattr(parent_type, "fields"):
+            return 0
+
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                if name.startswith("__"):
+                    # introspection reads the schema in memory, its lists are not paginated
+                    cost += self.object_cost if selection.selection_set else 0
+                    continue
+                definition = parent_type.fields.get(name)
+                if definition is None:
+                    continue
+                weight = self._weight(definition)
+                if is_leaf_type(get_named_type(definition.type)):
+                    cost += weight or 0
+                    continue
+                if get_named_type(parent_type).name.endswith("Connection"):
+                    # edges of a connection are already counted by its page size
+                    page_size = 1
+                else:
+                    page_size = self._page_size(selection, definition)
+                cost += (self.object_cost if weight is None else weight) + page_size * self.selection_cost(
+                    selection.selection_set, get_named_type(definition.type), visited
+                )
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = self.validation.schema.get_type(selection.type_condition.name.value)
+                cost += self.selection_cost(selection.selection_set, fragment_type, visited)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.validation.get_fragment(name)
+                if fragment is None or name in visited:
+                    continue
+                fragment_type = self.validation.schema.get_type(fragment.type_condition.name.value)
+                cost += self.selection_cost(fragment.selection_set, fragment_type, visited | {name})
+        return cost
@@ -1,6 +1,40 @@
 import strawberry
+from django.db import connections
 from strawberry.relay.types import NodeType
 from strawberry_django import relay
+from strawberry_django.optimizer import is_optimized_by_prefetching
+from strawberry_django.pagination import get_total_count
+from strawberry_django.resolvers import django_resolver
+
+
+def estimate_count(queryset) -> int | None:
+    """
+    The planner's row estimate for the table of an unfiltered queryset,
+     or None when the database keeps no estimate (or hasn't analysed the table yet).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+def cached_total_count(queryset) -> int | None:
+    """
+    The total count carried by the window annotation of a page prefetched by the optimizer,
+     without running any query; None when a COUNT is needed.
+    """
+    if not is_optimized_by_prefetching(queryset) or queryset.query.distinct:
+        return None
+    results = queryset._result_cache
+    if not results:
+        return None
+    return getattr(results[0], "_strawberry_total_count", None)
 
 
 @strawberry.type(name="CursorConnection")
@@ -16,6 +50,8 @@ class CursorConnection(relay.DjangoCursorConnection[NodeType]):
     page size, we override `resolve_connection` to fall back to
     DEFAULT_FIRST when neither argument is given.
     """
+    TOTAL_COUNT_MODE = "exact"
+    TOTAL_COUNT_THRESHOLD = 10_000
 
     @classmethod
     def resolve_connection(
@@ -32,3 +68,53 @@ class CursorConnection(relay.DjangoCursorConnection[NodeType]):
             last=last,
             **kwargs,
         )
+
+    approximate_count: strawberry.Private[tuple[int, bool] | None] = None
+
+    def _approximate_count(self) -> tuple[int, bool]:
+        """
+        `(count, is_exact)`, computed once per connection.
+
+        An unfiltered queryset is answered by the planner's estimate on large tables,
+         anything else is counted exactly up to TOTAL_COUNT_THRESHOLD
+         and reported as "at least TOTAL_COUNT_THRESHOLD" above it.
+        """
+        if self.approximate_count is None:
+            queryset = self.total_count_qs
+            estimate = None
+            if not queryset.query.has_filters() and not queryset.query.distinct:
+                estimate = estimate_count(queryset)
+            if estimate is not None and estimate > self.TOTAL_COUNT_THRESHOLD:
+                self.approximate_count = (estimate, False)
+            else:
+                limit = self.TOTAL_COUNT_THRESHOLD
+                count = queryset.order_by().values("pk")[: limit + 1].count()
+                self.approximate_count = (min(count, limit), count <= limit)
+        return self.approximate_count
+
+    @strawberry.field(
+        description="Total quantity of existing nodes, "
+        "a lower bound or an estimate when `totalCountIsExact` is false."
+    )
+    def total_count(self) -> int:
+        assert self.total_count_qs is not None
+        if self.TOTAL_COUNT_MODE == "approximate":
+            return django_resolver(lambda: self._approximate_count()[0])()
+
+        total_count = cached_total_count(self.total_count_qs)
+        if total_count is None:
+            total_count = django_resolver(get_total_count)(self.total_count_qs)
+        return total_count
+
+    @strawberry.field(description="Whether `totalCount` is an exact count.")
+    def total_count_is_exact(self) -> bool:
+        if self.TOTAL_COUNT_MODE != "approximate":
+            return True
+        return django_resolver(lambda: self._approximate_count()[1])()
+
+
+@strawberry.type(name="ApproximateCursorConnection")
+class ApproximateCursorConnection(CursorConnection[NodeType]):
+    """CursorConnection whose `totalCount` may be estimated on large tables."""
+
+    TOTAL_COUNT_MODE = "approximate"
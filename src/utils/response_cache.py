@@ -0,0 +1,192 @@
+import hashlib
+import json
+import uuid
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from graphql import ExecutionResult, get_named_type, get_nullable_type, is_list_type
+from graphql.language import print_ast
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+from strawberry.types.graphql import OperationType
+
+from .translations import get_header_language
+
+RESPONSE_CACHE_KEY = "graphql:response:%s"
+TAG_CACHE_KEY = "graphql:response-tag:%s"
+CACHE_MAX_AGE = "cache_max_age"
+CACHE_TAGS = "cache_tags"
+# set by `account.views` on login
+ACCESS_TOKEN_COOKIE = "access_token"
+
+_models_by_type = {}
+
+
+def instance_tag(model, pk) -> str:
+    return "%s:%s" % (model._meta.label_lower, pk)
+
+
+def model_tag(model) -> str:
+    return model._meta.label_lower
+
+
+def cache_hint(max_age: int | None = None, tags=()) -> dict:
+    """
+    Field metadata capping how long (in seconds) a response reading the field is cached,
+     0 never caches it: `strawberry_django.field(metadata=cache_hint(60))`.
+    `tags` are added to those responses, for fields reading data no model instance stands for.
+    """
+    metadata = {CACHE_TAGS: tuple(tags)}
+    if max_age is not None:
+        metadata[CACHE_MAX_AGE] = max_age
+    return metadata
+
+
+def invalidate_tags(*tags):
+    """Expires every cached response tagged with one of `tags` once the transaction commits."""
+    transaction.on_commit(
+        lambda: cache.set_many({TAG_CACHE_KEY % tag: uuid.uuid4().hex for tag in tags}, timeout=None)
+    )
+
+
+def invalidate_instance(model, pk):
+    """Expires responses that read the `model` row `pk`, and every list of `model`."""
+    invalidate_tags(instance_tag(model, pk), model_tag(model))
+
+
+def _tag_versions(tags) -> dict:
+    keys = {TAG_CACHE_KEY % tag: tag for tag in tags}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def _model_of_type(schema, type_name: str):
+    """Django model of a strawberry_django type, or of the nodes of a connection type."""
+    key = (id(schema), type_name)
+    if key not in _models_by_type:
+        model = None
+        graphql_type = schema.get_type(type_name)
+        definition = graphql_type.extensions.get(GraphQLCoreConverter.DEFINITION_BACKREF)
+        origin = getattr(definition, "origin", None)
+        django_definition = getattr(origin, "__strawberry_django_definition__", None)
+        if django_definition is not None:
+            model = django_definition.model
+        else:
+            edges = getattr(graphql_type, "fields", {}).get("edges")
+            if edges is not None:
+                node = get_named_type(edges.type).fields.get("node")
+                if node is not None:
+                    model = _model_of_type(schema, get_named_type(node.type).name)
+        _models_by_type[key] = model
+    return _models_by_type[key]
+
+
+def _has_credentials(request) -> bool:
+    """Whether `request` may belong to a user, decided without loading the user from the database."""
+    return bool(
+        request.headers.get("Authorization")
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.COOKIES.get(ACCESS_TOKEN_COOKIE)
+    )
+
+
+class ResponseCache(SchemaExtension):
+    """
+    Caches the results of queries sent without credentials, keyed by the normalised
+     document, variables, operation name and the language of the `Accept-Language` header.
+
+    Each result is tagged with the model instances it read (`<app>.<model>:<pk>`)
+     and the models it listed (`<app>.<model>`); `invalidate_instance` (called from
+     post_save/post_delete handlers) expires only the results carrying its tags.
+    It is kept for the smallest `cache_hint` of the resolved fields,
+     GRAPHQL_RESPONSE_CACHE_TIMEOUT when none has one.
+    A hit is answered before execution, without running resolvers or queries.
+
+    A result is stored against tag versions read before the data they guard:
+     the tags of the expired entry before executing, list and field tags before their resolver runs.
+     An invalidation committed while the operation runs then leaves the entry already stale.
+    """
+
+    def on_execute(self) -> Iterator[None]:
+        context = self.execution_context
+        self.tags = None
+        if not self._is_cacheable():
+            yield
+            return
+
+        request = getattr(context.context, "request", None)
+        self.key = RESPONSE_CACHE_KEY % hashlib.sha256(
+            json.dumps(
+                [
+                    print_ast(context.graphql_document),
+                    context.operation_name,
+                    context.variables,
+                    get_header_language(request) or settings.LANGUAGE_CODE,
+                ],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+        entry = cache.get(self.key)
+        self.versions = {}
+        if entry is not None:
+            self.versions = _tag_versions(entry["tags"])
+            if self.versions == entry["tags"]:
+                context.result = ExecutionResult(data=entry["data"])
+                yield
+                return
+
+        self.tags = set()
+        self.max_age = settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+        yield
+
+        result = context.result
+        if (
+            isinstance(result, ExecutionResult)
+            and not result.errors
+            and result.data is not None
+            and self.max_age > 0
+        ):
+            versions = {tag: self.versions[tag] for tag in self.tags & self.versions.keys()}
+            versions.update(_tag_versions(self.tags - versions.keys()))
+            cache.set(self.key, {"data": result.data, "tags": versions}, timeout=self.max_age)
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if self.tags is not None:
+            if isinstance(root, models.Model):
+                self.tags.add(instance_tag(type(root), root.pk))
+            return_type = get_nullable_type(info.return_type)
+            named_type = get_named_type(return_type)
+            if is_list_type(return_type) or named_type.name.endswith("Connection"):
+                model = _model_of_type(info.schema, named_type.name)
+                if model is not None:
+                    self._add_field_tag(model_tag(model))
+            field = info.parent_type.fields.get(info.field_name)
+            definition = field.extensions.get("strawberry-definition") if field is not None else None
+            metadata = getattr(definition, "metadata", None) or {}
+            for tag in metadata.get(CACHE_TAGS, ()):
+                self._add_field_tag(tag)
+            max_age = metadata.get(CACHE_MAX_AGE)
+            if max_age is not None:
+                self.max_age = min(self.max_age, max_age)
+        return _next(root, info, *args, **kwargs)
+
+    def _add_field_tag(self, tag):
+        # read before the field resolves, so changes committed meanwhile expire the result
+        if tag not in self.versions:
+            self.versions.update(_tag_versions([tag]))
+        self.tags.add(tag)
+
+    def _is_cacheable(self) -> bool:
+        # runs in the event loop of async views, so the user itself is never loaded here
+        context = self.execution_context
+        if context.operation_type != OperationType.QUERY:
+            return False
+        request = getattr(context.context, "request", None)
+        return request is None or not _has_credentials(request)
@@ -0,0 +1,102 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+
+class VersionedSnapshot:
+    """
+    Read-only value kept per process and rebuilt once the version key
+     in the shared cache differs from the one it was built for.
+
+    With `cache_key` (a `%s` pattern taking the version) the `dump`ed value is also
+     shared, so other processes `load` it instead of building their own.
+
+    Changes a thread makes inside a transaction stay invisible to the others until it commits:
+     meanwhile that thread gets its own value, built once and kept until the transaction
+     commits, rolls back, or invalidates again.
+    """
+
+    def __init__(self, version_key: str, build, cache_key=None, dump=None, load=None, timeout=None):
+        self.version_key = version_key
+        self.build = build
+        self.cache_key = cache_key
+        self.dump = dump
+        self.load = load
+        self.timeout = timeout
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get_version(self) -> str:
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get(self):
+        version = self.get_version()
+
+        value = self._get_uncommitted(version)
+        if value is not None:
+            return value
+
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != version:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot[0] != version:
+                    snapshot = self._snapshot = (version, self._fetch(version))
+        return snapshot[1]
+
+    def invalidate(self):
+        """
+        Drops the value of this process at once and, after the running transaction
+         commits, bumps the shared version so every other process rebuilds its own.
+        """
+        self._snapshot = None
+
+        def bump():
+            cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+        transaction.on_commit(bump)
+        if connection.in_atomic_block:
+            self._local.pending = [*getattr(self._local, "pending", ()), bump]
+            self._local.value = None
+
+    def _fetch(self, version):
+        if self.cache_key is None:
+            return self.build(version)
+        data = cache.get(self.cache_key % version)
+        if data is not None:
+            return self.load(data, version)
+        value = self.build(version)
+        cache.set(self.cache_key % version, self.dump(value), timeout=self.timeout)
+        return value
+
+    def _get_uncommitted(self, version):
+        """
+        The value of this thread while it has uncommitted changes, `None` otherwise.
+
+        Every invalidation leaves its version bump on the commit callbacks of the transaction,
+         and a rolled back savepoint discards the callbacks it registered, so the bumps still
+         waiting there tell which changes are alive.
+        """
+        pending = getattr(self._local, "pending", None)
+        if not pending:
+            return None
+        waiting = (
+            {id(func) for _, func, *_ in connection.run_on_commit}
+            if connection.in_atomic_block else set()
+        )
+        alive = [bump for bump in pending if id(bump) in waiting]
+        if len(alive) != len(pending):
+            self._local.value = None
+        self._local.pending = alive
+        if not alive:
+            return None
+        if self._local.value is None:
+            self._local.value = self.build(version)
+        return self._local.value
@@ -0,0 +1,251 @@
+import bisect
+import contextvars
+import heapq
+import inspect
+import threading
+import time
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.functional import LazyObject
+from graphql import OperationDefinitionNode
+from strawberry.extensions import SchemaExtension
+
+TRACE_HEADER = "X-GraphQL-Trace"
+SLOWEST_RESOLVERS = 10
+# upper bounds of the histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# operation names are chosen by clients, those past the first ones share a single series
+MAX_OPERATIONS = 200
+OTHER_OPERATION = "other"
+
+_current_trace = contextvars.ContextVar("graphql_trace", default=None)
+
+
+def _record_query(execute, sql, params, many, context):
+    trace = _current_trace.get()
+    if trace is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        trace.sql_count += 1
+        trace.sql_duration += time.perf_counter() - start
+
+
+def _install(connection):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # queries run in the threads of `sync_to_async`, each with its own connections
+    _install(connection)
+
+
+class Trace:
+    __slots__ = ("phases", "resolvers", "sql_count", "sql_duration")
+
+    def __init__(self):
+        self.phases = {}
+        self.resolvers = []
+        self.sql_count = 0
+        self.sql_duration = 0.0
+
+
+class OperationStats:
+    """
+    In-process histogram of operation durations and SQL counts, per operation name.
+    Past `max_operations` names, new ones are counted under `OTHER_OPERATION`.
+    """
+
+    def __init__(self, max_operations=MAX_OPERATIONS):
+        self._lock = threading.Lock()
+        self._operations = {}
+        self.max_operations = max_operations
+
+    def observe(self, name: str, duration: float, sql_count: int, sql_duration: float):
+        with self._lock:
+            if name not in self._operations and len(self._operations) >= self.max_operations:
+                name = OTHER_OPERATION
+            stats = self._operations.setdefault(
+                name, {"buckets": [0] * (len(BUCKETS) + 1), "count": 0, "sum": 0.0, "sql_count": 0, "sql_sum": 0.0}
+            )
+            stats["buckets"][bisect.bisect_left(BUCKETS, duration)] += 1
+            stats["count"] += 1
+            stats["sum"] += duration
+            stats["sql_count"] += sql_count
+            stats["sql_sum"] += sql_duration
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {**stats, "buckets": list(stats["buckets"])}
+                for name, stats in self._operations.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition of the collected histograms."""
+        lines = [
+            "# TYPE graphql_operation_duration_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        snapshot = {_escape_label(name): stats for name, stats in snapshot.items()}
+        for name, stats in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), stats["buckets"]):
+                cumulative += count
+                lines.append(
+                    'graphql_operation_duration_seconds_bucket{operation="%s",le="%s"} %d'
+                    % (name, bound, cumulative)
+                )
+            lines.append('graphql_operation_duration_seconds_sum{operation="%s"} %f' % (name, stats["sum"]))
+            lines.append('graphql_operation_duration_seconds_count{operation="%s"} %d' % (name, stats["count"]))
+        lines.append("# TYPE graphql_operation_sql_queries_total counter")
+        for name, stats in sorted(snapshot.items()):
+            lines.append('graphql_operation_sql_queries_total{operation="%s"} %d' % (name, stats["sql_count"]))
+        lines.append("# TYPE graphql_operation_sql_duration_seconds_total counter")
+        for name, stats in sorted(snapshot.items()):
+            lines.append('graphql_operation_sql_duration_seconds_total{operation="%s"} %f' % (name, stats["sql_sum"]))
+        return "\n".join(lines) + "\n"
+
+
+operation_stats = OperationStats()
+
+
+@staff_member_required
+def graphql_metrics(request):
+    return HttpResponse(operation_stats.render(), content_type="text/plain; version=0.0.4")
+
+
+class OperationTracing(SchemaExtension):
+    """
+    Records for each operation its total time, the parse/validate/execute phases,
+     the slowest resolver paths and the number and duration of SQL queries.
+
+    Every operation feeds `operation_stats` (scraped from the admin metrics endpoint);
+     the trace itself is returned in the `tracing` response extension
+     when the request carries the `X-GraphQL-Trace` header (staff only outside DEBUG).
+    The staff check reads the user loaded by `utils.views.GraphQLView` before execution,
+     resolvers are only timed for those traced operations.
+    """
+
+    def on_operation(self) -> Iterator[None]:
+        self.trace = Trace()
+        self.requested = self._is_requested()
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+        token = _current_trace.set(self.trace)
+        self.start, self.duration = time.perf_counter(), None
+        try:
+            yield
+        finally:
+            self.duration = time.perf_counter() - self.start
+            _current_trace.reset(token)
+            operation_stats.observe(
+                self._operation_name(),
+                self.duration,
+                self.trace.sql_count,
+                self.trace.sql_duration,
+            )
+
+    def _operation_name(self) -> str:
+        """Name of the executed operation definition, rather than the one the client sent."""
+        context = self.execution_context
+        document = context.graphql_document
+        if document is None:
+            return "anonymous"
+        operations = [
+            definition
+            for definition in document.definitions
+            if isinstance(definition, OperationDefinitionNode)
+        ]
+        if context.operation_name:
+            operations = [
+                operation for operation in operations
+                if operation.name and operation.name.value == context.operation_name
+            ]
+        if len(operations) != 1 or operations[0].name is None:
+            return "anonymous"
+        return operations[0].name.value
+
+    def _phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.trace.phases[name] = time.perf_counter() - start
+
+    def on_parse(self) -> Iterator[None]:
+        yield from self._phase("parse")
+
+    def on_validate(self) -> Iterator[None]:
+        yield from self._phase("validate")
+
+    def on_execute(self) -> Iterator[None]:
+        yield from self._phase("execute")
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if not self.requested:
+            return _next(root, info, *args, **kwargs)
+        start = time.perf_counter()
+        result = _next(root, info, *args, **kwargs)
+        if inspect.isawaitable(result):
+            return self._await_resolver(result, start, info)
+        self._record_resolver(start, info)
+        return result
+
+    async def _await_resolver(self, result, start, info):
+        try:
+            return await result
+        finally:
+            self._record_resolver(start, info)
+
+    def _record_resolver(self, start, info):
+        entry = (time.perf_counter() - start, ".".join(map(str, info.path.as_list())))
+        if len(self.trace.resolvers) < SLOWEST_RESOLVERS:
+            heapq.heappush(self.trace.resolvers, entry)
+        else:
+            heapq.heappushpop(self.trace.resolvers, entry)
+
+    def get_results(self) -> dict:
+        if not self.requested:
+            return {}
+        # results of failed operations are collected before the operation hook finishes
+        duration = self.duration if self.duration is not None else time.perf_counter() - self.start
+        return {
+            "tracing": {
+                "duration": round(duration * 1000, 3),
+                "phases": {name: round(value * 1000, 3) for name, value in self.trace.phases.items()},
+                "resolvers": [
+                    {"path": path, "duration": round(duration * 1000, 3)}
+                    for duration, path in sorted(self.trace.resolvers, reverse=True)
+                ],
+                "sql": {"count": self.trace.sql_count, "duration": round(self.trace.sql_duration * 1000, 3)},
+            }
+        }
+
+    def _is_requested(self) -> bool:
+        request = getattr(self.execution_context.context, "request", None)
+        if request is None or not request.headers.get(TRACE_HEADER):
+            return False
+        if settings.DEBUG:
+            return True
+        user = getattr(request, "user", None)
+        if isinstance(user, LazyObject):
+            # not loaded before execution, loading it here would query from the event loop
+            return False
+        return bool(user and user.is_staff)
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.db.models import Prefetch
+from django.utils.translation.trans_real import parse_accept_lang_header
+from strawberry.types import Info
+
+from .languages import Language
+
+
+def fallback_languages(language: str) -> list[str]:
+    """The requested language followed by the default one, without duplicates."""
+    return list(dict.fromkeys((language, settings.LANGUAGE_CODE)))
+
+
+def get_header_language(request) -> str | None:
+    """First supported language of the `Accept-Language` header of `request`, if any."""
+    header = request.headers.get("Accept-Language") if request is not None else None
+    for code, _ in parse_accept_lang_header(header or ""):
+        code = code.split("-")[0].lower()
+        if code in Language.values:
+            return code
+    return None
+
+
+def get_request_language(info: Info, language: str | None = None) -> str | None:
+    """
+    Language asked by the running operation:
+     the explicit `language` argument wins, then the `Accept-Language` header of the request.
+    Unsupported codes are ignored, `None` means no language was asked at all.
+    """
+    if language:
+        return language if language in Language.values else None
+    return get_header_language(getattr(info.context, "request", None))
+
+
+def _language_attr(to_attr: str, language: str | None) -> str:
+    """`to_attr` of the rows loaded for `language`, so aliased fields asking other languages never share them."""
+    return "%s_%s" % (to_attr, language or settings.LANGUAGE_CODE)
+
+
+def translations_prefetch(
+    lookup: str, model, language: str | None, to_attr: str | None = None
+) -> Prefetch | str:
+    """
+    Prefetch of `lookup` restricted to the requested and default languages.
+    Without a language the whole relation is loaded, unless the rows go to `to_attr`
+     (a fallback lookup), then only the default language is.
+    """
+    if language is None and to_attr is None:
+        return lookup
+    languages = fallback_languages(language or settings.LANGUAGE_CODE)
+    return Prefetch(
+        lookup,
+        queryset=model.objects.filter(language_code__in=languages),
+        to_attr=_language_attr(to_attr, language) if to_attr else None,
+    )
+
+
+def prefetch_translations(model, lookup: str = "translations", to_attr: str | None = None):
+    """
+    Optimizer hint pushing the `language` argument of the field (or the Accept-Language header)
+     into the prefetch of its translations, so one filtered query serves the whole page.
+    Rows going to `to_attr` are stored per language, a field asking another language
+     than the one prefetched loads its own rows instead of reading the wrong ones.
+    """
+
+    def hint(info: Info):
+        arguments = info.selected_fields[0].arguments if info.selected_fields else {}
+        language = get_request_language(info, arguments.get("language"))
+        return translations_prefetch(lookup, model, language, to_attr=to_attr)
+
+    return hint
+
+
+def resolve_translations(instance, info: Info, language: str | None = None, lookup: str = "translations"):
+    """Translations of `instance` in the requested language, all of them when no language is asked."""
+    rows = getattr(instance, lookup).all()
+    language = get_request_language(info, language)
+    if language is None:
+        return list(rows)
+    return [row for row in rows if row.language_code == language]
+
+
+def resolve_translation(
+    instance, info: Info, language: str | None = None, lookup: str = "translations", to_attr: str | None = None
+):
+    """
+    Translation of `instance` in the requested language, falling back to the default language.
+    Reads the rows loaded by `prefetch_translations` into `to_attr` for that language,
+     so it never queries on its own when they were prefetched.
+    """
+    language = get_request_language(info, language) or settings.LANGUAGE_CODE
+    rows = getattr(instance, _language_attr(to_attr, language), None) if to_attr else None
+    if rows is None:
+        rows = getattr(instance, lookup).all()
+    by_language = {row.language_code: row for row in rows}
+    for code in fallback_languages(language):
+        if code in by_language:
+            return by_language[code]
+    return None
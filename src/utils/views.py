@@ -0,0 +1,13 @@
+from strawberry.django.views import AsyncGraphQLView
+
+
+class GraphQLView(AsyncGraphQLView):
+    """
+    Loads the user of the request before the operation runs, so schema extensions
+     (see `utils.tracing`) can read `request.user` without querying from the event loop.
+    """
+
+    async def get_context(self, request, response):
+        if hasattr(request, "auser"):
+            request.user = await request.auser()
+        return await super().get_context(request, response)
@@ -0,0 +1,35 @@
+import logging
+import os
+import time
+import tracemalloc
+from unittest import skipUnless
+
+benchmark = skipUnless(
+    os.environ.get("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to run benchmarks"
+)
+
+# results are logged at INFO instead of printed, see the `tests.benchmarks` logger in sandbox/settings.py
+logger = logging.getLogger(__name__)
+
+
+def timed(func, *args, repeat=5, setup=None, **kwargs) -> float:
+    """Best wall time of `repeat` runs, in seconds, `setup` runs untimed before each of them."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def allocated(func, *args, **kwargs) -> int:
+    """Bytes still allocated by the result of `func`."""
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)  # noqa: F841 keep the result alive while measuring
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current
@@ -0,0 +1,69 @@
+from django.db import models
+from django.test import TestCase
+
+from catalogue.models import Category
+
+from . import benchmark, logger, timed
+
+
+def refresh_with_subquery(node):
+    """The previous correlated `Exists` + `rstartswith` propagation."""
+    subquery = Category.objects.filter(
+        is_public=False,
+        path__rstartswith=models.OuterRef("path"),
+        depth__lt=models.OuterRef("depth"),
+    )
+    Category.get_tree(node).update(ancestors_are_public=~models.Exists(subquery.values("pk")))
+
+
+@benchmark
+class CategoryVisibilityBenchmark(TestCase):
+    """
+    Unpublishing a top-level category of a generated deep tree, with the correlated
+     subquery against the prefix-based propagation.
+
+        RUN_BENCHMARKS=1 python sandbox/manage.py test tests.benchmarks.test_category_visibility
+    """
+
+    depth = 10
+    fanout = 3
+    repeat = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        # Rows are generated directly, building ~60k nodes through treebeard would take minutes.
+        steplen, alphabet = Category.steplen, Category.alphabet
+        categories, level = [], [""]
+        for depth in range(1, cls.depth + 1):
+            level = [
+                parent + alphabet[index + 1].rjust(steplen, alphabet[0])
+                for parent in level
+                for index in range(cls.fanout if depth > 1 else 2)
+            ]
+            categories.extend(
+                Category(
+                    path=path, depth=depth, numchild=0 if depth == cls.depth else cls.fanout,
+                    name=path, slug=path, full_name=path, full_slug=path,
+                )
+                for path in level
+            )
+        Category.objects.bulk_create(categories, batch_size=5000)
+        cls.root = Category.objects.get(path=categories[0].path)
+        cls.size = len(categories)
+
+    def test_unpublish_root(self):
+        Category.objects.filter(pk=self.root.pk).update(is_public=False)
+
+        def reset():
+            Category.objects.update(ancestors_are_public=True)
+
+        subquery = timed(refresh_with_subquery, self.root, repeat=self.repeat, setup=reset)
+        expected = dict(Category.objects.values_list("pk", "ancestors_are_public"))
+        prefix = timed(
+            Category.objects.refresh_ancestors_are_public, [self.root], repeat=self.repeat, setup=reset
+        )
+        self.assertEqual(dict(Category.objects.values_list("pk", "ancestors_are_public")), expected)
+
+        logger.info(
+            "%d categories: subquery %8.3f s  prefix %8.3f s", self.size, subquery, prefix
+        )
@@ -0,0 +1,141 @@
+import random
+
+from django.db import connection
+from django.test import TestCase
+
+from products.models import ProductClass, ProductClassClosure, ProductClassEdge
+
+from . import benchmark, logger, timed
+
+ANCESTORS_CTE = """
+WITH RECURSIVE ancestors AS (
+    SELECT parent_id, 1 AS depth
+    FROM products_productclassedge
+    WHERE child_id = %s
+    UNION ALL
+    SELECT edge.parent_id, a.depth + 1
+    FROM products_productclassedge edge
+    INNER JOIN ancestors a ON edge.child_id = a.parent_id
+)
+SELECT parent_id, MIN(depth) AS depth FROM ancestors GROUP BY parent_id ORDER BY depth ASC;
+"""
+
+DESCENDANTS_CTE = """
+WITH RECURSIVE descendants AS (
+    SELECT child_id, 1 AS depth
+    FROM products_productclassedge
+    WHERE parent_id = %s
+    UNION ALL
+    SELECT edge.child_id, d.depth + 1
+    FROM products_productclassedge edge
+    INNER JOIN descendants d ON edge.parent_id = d.child_id
+)
+SELECT child_id, MIN(depth) AS depth FROM descendants GROUP BY child_id ORDER BY depth ASC;
+"""
+
+CYCLE_CTE = """
+WITH RECURSIVE descendants AS (
+    SELECT child_id FROM products_productclassedge WHERE parent_id = %s
+    UNION
+    SELECT edge.child_id
+    FROM products_productclassedge edge
+    INNER JOIN descendants d ON edge.parent_id = d.child_id
+)
+SELECT 1 FROM descendants WHERE child_id = %s LIMIT 1;
+"""
+
+ANCESTORS_CLOSURE = """
+SELECT ancestor_id, depth FROM products_productclassclosure
+WHERE descendant_id = %s AND depth > 0 ORDER BY depth ASC;
+"""
+
+DESCENDANTS_CLOSURE = """
+SELECT descendant_id, depth FROM products_productclassclosure
+WHERE ancestor_id = %s AND depth > 0 ORDER BY depth ASC;
+"""
+
+CYCLE_CLOSURE = """
+SELECT 1 FROM products_productclassclosure
+WHERE ancestor_id = %s AND descendant_id = %s LIMIT 1;
+"""
+
+
+def run_sql(sql, *params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+@benchmark
+class ProductClassClosureBenchmark(TestCase):
+    """
+    Ancestor/descendant lookups and cycle checks on the closure table
+     against the recursive CTEs they replaced, on a generated DAG.
+
+        RUN_BENCHMARKS=1 python sandbox/manage.py test tests.benchmarks.test_product_class_closure
+    """
+
+    layers = 8
+    layer_size = 400
+    samples = 200
+
+    @classmethod
+    def setUpTestData(cls):
+        # Taxonomy-like DAG: every class inherits from a class of the previous layer,
+        #  and one in ten also from a second one.
+        rnd = random.Random(7)
+        ProductClass.objects.bulk_create(
+            ProductClass(title=f"class {i}", slug=f"class-{i}")
+            for i in range(cls.layers * cls.layer_size)
+        )
+        ids = list(ProductClass.objects.order_by("pk").values_list("pk", flat=True))
+        layers = [ids[i : i + cls.layer_size] for i in range(0, len(ids), cls.layer_size)]
+        edges = {
+            (parent, child)
+            for previous, layer in zip(layers, layers[1:])
+            for child in layer
+            for parent in rnd.sample(previous, k=2 if rnd.random() < 0.1 else 1)
+        }
+        ProductClassEdge.objects.bulk_create(
+            ProductClassEdge(parent_id=parent, child_id=child) for parent, child in edges
+        )
+        ProductClassClosure.objects.rebuild()
+        cls.sample_ids = rnd.sample(ids, cls.samples)
+        cls.pairs = [tuple(rnd.sample(ids, 2)) for _ in range(cls.samples)]
+
+    def test_lookups(self):
+        manager = ProductClass.objects
+        cases = {
+            "ancestors": (
+                lambda: [run_sql(ANCESTORS_CTE, pk) for pk in self.sample_ids],
+                lambda: [run_sql(ANCESTORS_CLOSURE, pk) for pk in self.sample_ids],
+                lambda: [manager.get_ancestor_ids(pk) for pk in self.sample_ids],
+            ),
+            "descendants": (
+                lambda: [run_sql(DESCENDANTS_CTE, pk) for pk in self.sample_ids],
+                lambda: [run_sql(DESCENDANTS_CLOSURE, pk) for pk in self.sample_ids],
+                lambda: [manager.get_descendant_ids(pk) for pk in self.sample_ids],
+            ),
+            "check_cycle": (
+                lambda: [bool(run_sql(CYCLE_CTE, c, p)) for p, c in self.pairs],
+                lambda: [bool(run_sql(CYCLE_CLOSURE, c, p)) for p, c in self.pairs],
+                lambda: [manager.check_cycle(p, c) for p, c in self.pairs],
+            ),
+        }
+
+        for pk in self.sample_ids[:20]:
+            self.assertEqual(
+                dict(run_sql(ANCESTORS_CTE, pk)),
+                {row["parent_id"]: row["depth"] for row in manager.get_ancestor_ids(pk)},
+            )
+        self.assertEqual(cases["check_cycle"][0](), cases["check_cycle"][2]())
+
+        logger.info("%s, per lookup:", connection.vendor)
+        for label, variants in cases.items():
+            cte, closure, manager_lookup = (
+                timed(variant, repeat=3) / self.samples * 1e3 for variant in variants
+            )
+            logger.info(
+                "%12s: cte %8.3f ms  closure %8.3f ms  manager %8.3f ms",
+                label, cte, closure, manager_lookup,
+            )
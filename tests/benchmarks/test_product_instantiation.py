@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from products.models import Product
+
+from . import allocated, benchmark, logger, timed
+
+
+@benchmark
+class ProductInstantiationBenchmark(SimpleTestCase):
+    """
+    Per-instance cost of materialising products, with the attribute container
+     left untouched (lazy) and built for every row (the former eager behaviour).
+
+        RUN_BENCHMARKS=1 python sandbox/manage.py test tests.benchmarks.test_product_instantiation
+
+    Results are logged on the `tests.benchmarks` logger.
+    """
+
+    count = 100_000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        now = timezone.now()
+        cls.field_names = [field.attname for field in Product._meta.concrete_fields]
+        defaults = {"id": 1, "product_type_id": 1, "metadata": {}, "is_public": True}
+        cls.row = tuple(
+            defaults.get(name, now if name.endswith("_at") else "product")
+            for name in cls.field_names
+        )
+
+    def materialise(self, touch_attr):
+        products = [
+            Product.from_db("default", self.field_names, self.row)
+            for _ in range(self.count)
+        ]
+        if touch_attr:
+            for product in products:
+                product.attr  # noqa: B018
+        return products
+
+    def test_construction(self):
+        results = {}
+        for label, touch_attr in (("lazy", False), ("eager", True)):
+            seconds = timed(self.materialise, touch_attr, repeat=3)
+            memory = allocated(self.materialise, touch_attr)
+            results[label] = (seconds / self.count, memory / self.count)
+
+        for label, (seconds, memory) in results.items():
+            logger.info(
+                "%6s: %8.3f µs/instance %8.1f B/instance", label, seconds * 1e6, memory
+            )
+        self.assertLess(results["lazy"][1], results["eager"][1])
@@ -0,0 +1,78 @@
+import io
+import json
+
+from django.test import TestCase
+
+from catalogue.bulk import export_csv, export_json, import_categories, read_csv
+from catalogue.models import Category, CategoryProductCount, CategoryTranslation
+
+TREE = [
+    {
+        "name": "Men",
+        "slug": "men",
+        "meta_title": "Men's fashion",
+        "translations": {"fa": {"name": "مردانه"}},
+        "children": [
+            {"name": "Shoes", "slug": "shoes", "is_public": False, "children": [
+                {"name": "Running", "slug": "running"},
+            ]},
+            {"name": "Shirts", "slug": "shirts"},
+        ],
+    },
+    {"name": "Women", "slug": "women", "description": "All for women"},
+]
+
+
+class TestCategoryBulkImport(TestCase):
+    def test_import_builds_a_valid_tree(self):
+        existing = Category.add_root(name="Kids", slug="kids")
+
+        with self.assertNumQueries(6):
+            import_categories(TREE)
+
+        self.assertEqual(Category.find_problems(), ([], [], [], [], []))
+        self.assertEqual(
+            [category.full_slug for category in Category.get_tree()],
+            ["kids", "men", "men/shoes", "men/shoes/running", "men/shirts", "women"],
+        )
+        running = Category.objects.get(slug="running")
+        self.assertEqual(running.full_name, "Men > Shoes > Running")
+        self.assertFalse(running.ancestors_are_public)
+        self.assertEqual(Category.objects.get(slug="men").numchild, 2)
+        self.assertEqual(CategoryTranslation.objects.get(category__slug="men").name, "مردانه")
+        self.assertEqual(CategoryProductCount.objects.count(), 6)
+
+        import_categories([{"name": "Toys", "slug": "toys"}], parent=existing)
+        existing.refresh_from_db()
+        self.assertEqual(existing.numchild, 1)
+        self.assertEqual(existing.get_children().get().full_slug, "kids/toys")
+
+    def test_round_trip(self):
+        import_categories(TREE)
+        exported = json.loads("".join(export_json()))
+        self.assertEqual(exported[0]["children"][0]["children"][0]["slug"], "running")
+        self.assertEqual(exported[0]["translations"], {"fa": {"name": "مردانه"}})
+
+        rows = "".join(export_csv(languages=["fa"]))
+        Category.objects.all().delete()
+        import_categories(read_csv(io.StringIO(rows)))
+        self.assertEqual(json.loads("".join(export_json())), exported)
+
+    def test_export_json_nests_children(self):
+        import_categories(TREE)
+        exported = json.loads("".join(export_json(Category.objects.get(slug="shoes"))))
+        self.assertEqual(
+            [(node["slug"], [child["slug"] for child in node["children"]]) for node in exported],
+            [("shoes", ["running"])],
+        )
+        self.assertEqual(exported[0]["children"][0]["children"], [])
+        self.assertEqual(len(json.loads("".join(export_json()))), 2)
+
+    def test_import_under_a_stale_parent(self):
+        kids = Category.add_root(name="Kids", slug="kids")
+        stale = Category.objects.get(pk=kids.pk)
+        import_categories([{"name": "Toys", "slug": "toys"}], parent=kids)
+
+        import_categories([{"name": "Games", "slug": "games"}], parent=stale)
+        self.assertEqual(stale.numchild, 2)
+        self.assertEqual(Category.find_problems(), ([], [], [], [], []))
@@ -0,0 +1,63 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from catalogue.models import Category
+from sandbox.schema.dashboard import schema
+
+from ..helpers import graphql_context
+
+TREE_QUERY = """
+query {
+  rootCategories {
+    edges {
+      node {
+        name
+        children {
+          name
+          ancestors { name }
+          children { name ancestors { name } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class TestCategoryTreeDataLoaders(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for root_index in range(3):
+            root = Category.add_root(name=f"root-{root_index}", slug=f"root-{root_index}")
+            for child_index in range(3):
+                child = root.add_child(
+                    name=f"child-{root_index}-{child_index}",
+                    slug=f"child-{root_index}-{child_index}",
+                )
+                child.add_child(
+                    name=f"leaf-{root_index}-{child_index}",
+                    slug=f"leaf-{root_index}-{child_index}",
+                )
+
+    def execute(self):
+        result = async_to_sync(schema.execute)(TREE_QUERY, context_value=graphql_context())
+        self.assertIsNone(result.errors)
+        return result.data["rootCategories"]["edges"]
+
+    def test_tree_is_resolved_in_constant_queries(self):
+        # root page, children per level, ancestors per level
+        with self.assertNumQueries(5):
+            edges = self.execute()
+
+        root = edges[0]["node"]
+        self.assertEqual(
+            [child["name"] for child in root["children"]],
+            ["child-0-0", "child-0-1", "child-0-2"],
+        )
+        child = root["children"][1]
+        self.assertEqual(child["ancestors"], [{"name": "root-0"}])
+        self.assertEqual(child["children"][0]["name"], "leaf-0-1")
+        self.assertEqual(
+            child["children"][0]["ancestors"],
+            [{"name": "root-0"}, {"name": "child-0-1"}],
+        )
@@ -0,0 +1,67 @@
+from django.test import TestCase
+
+from catalogue.models import Category
+
+
+class TestCategoryFullNames(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        cls.women = Category.add_root(name="Women", slug="women")
+        cls.shoes = cls.men.add_child(name="Shoes", slug="shoes")
+        cls.running = cls.shoes.add_child(name="Running", slug="running")
+
+    def assertFullNames(self, category, full_name, full_slug):
+        category.refresh_from_db()
+        self.assertEqual((category.full_name, category.full_slug), (full_name, full_slug))
+
+    def test_created_nodes(self):
+        self.assertFullNames(self.running, "Men > Shoes > Running", "men/shoes/running")
+        self.assertEqual(Category.objects.get(full_slug="men/shoes/running"), self.running)
+
+    def test_rename_rewrites_subtree(self):
+        self.shoes.name = "Footwear"
+        self.shoes.slug = "footwear"
+        self.shoes.save()
+
+        self.assertFullNames(self.shoes, "Men > Footwear", "men/footwear")
+        self.assertFullNames(self.running, "Men > Footwear > Running", "men/footwear/running")
+        self.assertFullNames(self.men, "Men", "men")
+
+    def test_move_rewrites_subtree(self):
+        self.shoes.move(self.women, "last-child")
+
+        self.assertFullNames(self.shoes, "Women > Shoes", "women/shoes")
+        self.assertFullNames(self.running, "Women > Shoes > Running", "women/shoes/running")
+
+    def test_stale_instance_keeps_subtree_consistent(self):
+        stale_shoes = Category.objects.get(pk=self.shoes.pk)
+        self.men.name = "Males"
+        self.men.save()
+
+        stale_shoes.slug = "footwear"
+        stale_shoes.save()
+
+        self.assertFullNames(stale_shoes, "Males > Shoes", "men/footwear")
+        self.assertFullNames(self.running, "Males > Shoes > Running", "men/footwear/running")
+
+    def test_saving_a_node_loaded_before_its_parent_was_renamed(self):
+        stale_shoes = Category.objects.get(pk=self.shoes.pk)
+        self.men.name = "Males"
+        self.men.slug = "males"
+        self.men.save()
+
+        stale_shoes.save()
+
+        self.assertFullNames(stale_shoes, "Males > Shoes", "males/shoes")
+        self.assertFullNames(self.running, "Males > Shoes > Running", "males/shoes/running")
+
+        stale_shoes = Category.objects.get(pk=self.shoes.pk)
+        self.men.name = "Men"
+        self.men.save()
+
+        stale_shoes.name = "Footwear"
+        stale_shoes.save(update_fields=["name"])
+
+        self.assertFullNames(stale_shoes, "Men > Footwear", "males/shoes")
+        self.assertFullNames(self.running, "Men > Footwear > Running", "males/shoes/running")
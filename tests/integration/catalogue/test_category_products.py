@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from catalogue.models import Category, CategoryProductCount, ProductCategory
+from products.models import Product, ProductClass
+
+
+class TestCategoryProducts(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        cls.shoes = cls.men.add_child(name="Shoes", slug="shoes")
+        cls.running = cls.shoes.add_child(name="Running", slug="running")
+        cls.women = Category.add_root(name="Women", slug="women")
+
+        product_class = ProductClass.objects.create(title="Shoe", slug="shoe")
+        cls.sneaker, cls.boot, cls.sandal = (
+            Product.objects.create(product_type=product_class, title=title, slug=title)
+            for title in ("sneaker", "boot", "sandal")
+        )
+        cls.sneaker.categories.add(cls.running, cls.shoes)
+        cls.boot.categories.add(cls.shoes)
+        ProductCategory.objects.create(product=cls.sandal, category=cls.women)
+
+    def counts(self):
+        return {
+            count.category.slug: (count.direct_count, count.subtree_count)
+            for count in CategoryProductCount.objects.select_related("category")
+        }
+
+    def test_in_category(self):
+        self.assertCountEqual(
+            Product.objects.in_category(self.men), [self.sneaker, self.boot]
+        )
+        self.assertCountEqual(
+            Product.objects.in_category(self.shoes, include_descendants=False),
+            [self.sneaker, self.boot],
+        )
+        self.assertCountEqual(Product.objects.in_category(self.running), [self.sneaker])
+
+    def test_counts_follow_links(self):
+        self.assertEqual(
+            self.counts(),
+            {"men": (0, 2), "shoes": (2, 2), "running": (1, 1), "women": (1, 1)},
+        )
+
+        self.sneaker.categories.remove(self.shoes)
+        self.sandal.categories.clear()
+        self.assertEqual(
+            self.counts(),
+            {"men": (0, 2), "shoes": (1, 2), "running": (1, 1), "women": (0, 0)},
+        )
+
+    def test_counts_follow_publishing(self):
+        self.boot.is_public = False
+        self.boot.save()
+        self.assertEqual(self.counts()["men"], (0, 1))
+        self.assertEqual(self.counts()["shoes"], (1, 1))
+
+        self.boot.is_public = True
+        self.boot.save(update_fields=["is_public"])
+        self.assertEqual(self.counts()["shoes"], (2, 2))
+
+    def test_other_product_changes_keep_counts(self):
+        self.boot.title = "Boot"
+        with mock.patch.object(CategoryProductCount.objects, "refresh") as refresh:
+            self.boot.save()
+            self.boot.save(update_fields=["is_public"])
+        refresh.assert_not_called()
+
+    def test_new_categories_have_counts(self):
+        kids = Category.add_root(name="Kids", slug="kids")
+        kids.add_child(name="Toys", slug="toys")
+        self.assertEqual(self.counts()["kids"], (0, 0))
+        self.assertEqual(self.counts()["toys"], (0, 0))
+
+    def test_deleting_a_category_recounts_surviving_ancestors(self):
+        Category.objects.get(pk=self.shoes.pk).delete()
+
+        self.assertEqual(self.counts(), {"men": (0, 0), "women": (1, 1)})
+
+    def test_counts_follow_moves(self):
+        self.running.move(self.women, "last-child")
+
+        counts = self.counts()
+        self.assertEqual(counts["men"], (0, 2))
+        self.assertEqual(counts["women"], (1, 2))
+        self.assertEqual(counts["running"], (1, 1))
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, TestCase
+
+from catalogue.models import Category, CategoryTranslation
+from sandbox.schema.dashboard import schema
+from utils.translations import resolve_translation, translations_prefetch
+
+from ..helpers import graphql_context
+
+TRANSLATIONS_QUERY = """
+query ($language: String) {
+  categories {
+    edges {
+      node {
+        slug
+        translations(language: $language) { languageCode name }
+        translation(language: $language) { languageCode name }
+      }
+    }
+  }
+}
+"""
+
+
+class TestCategoryTranslations(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(3):
+            category = Category.add_root(name=f"category-{index}", slug=f"category-{index}")
+            CategoryTranslation.objects.create(
+                category=category, language_code="en", name=f"en-{index}"
+            )
+            if index != 2:
+                CategoryTranslation.objects.create(
+                    category=category, language_code="fa", name=f"fa-{index}"
+                )
+            CategoryTranslation.objects.create(
+                category=category, language_code="de", name=f"de-{index}"
+            )
+
+    def execute(self, language=None, request=None):
+        result = async_to_sync(schema.execute)(
+            TRANSLATIONS_QUERY,
+            variable_values={"language": language},
+            context_value=graphql_context(request),
+        )
+        self.assertIsNone(result.errors)
+        return {edge["node"]["slug"]: edge["node"] for edge in result.data["categories"]["edges"]}
+
+    def test_language_is_pushed_into_prefetch(self):
+        # page, translations, fallback translations
+        with self.assertNumQueries(3):
+            nodes = self.execute("fa")
+
+        self.assertEqual(
+            nodes["category-0"]["translations"], [{"languageCode": "FA", "name": "fa-0"}]
+        )
+        self.assertEqual(nodes["category-2"]["translations"], [])
+
+    def test_translation_falls_back_to_default_language(self):
+        nodes = self.execute("fa")
+        self.assertEqual(nodes["category-1"]["translation"]["name"], "fa-1")
+        self.assertEqual(nodes["category-2"]["translation"]["name"], "en-2")
+
+    def test_accept_language_header(self):
+        request = RequestFactory().get("/", headers={"Accept-Language": "de-DE,de;q=0.9,en;q=0.8"})
+        nodes = self.execute(request=request)
+        self.assertEqual(nodes["category-0"]["translation"]["name"], "de-0")
+
+    def test_all_translations_without_language(self):
+        nodes = self.execute()
+        self.assertEqual(len(nodes["category-0"]["translations"]), 3)
+        self.assertEqual(nodes["category-2"]["translation"]["name"], "en-2")
+
+    def test_aliases_with_different_languages(self):
+        query = """
+        query ($first: String, $second: String) {
+          categories {
+            edges {
+              node {
+                slug
+                first: translation(language: $first) { name }
+                second: translation(language: $second) { name }
+              }
+            }
+          }
+        }
+        """
+        result = async_to_sync(schema.execute)(
+            query, variable_values={"first": "fa", "second": "de"}, context_value=graphql_context()
+        )
+        self.assertIsNone(result.errors)
+        node = result.data["categories"]["edges"][0]["node"]
+        self.assertEqual((node["first"]["name"], node["second"]["name"]), ("fa-0", "de-0"))
+
+    def test_rows_prefetched_for_another_language_are_not_read(self):
+        category = Category.objects.prefetch_related(
+            translations_prefetch("translations", CategoryTranslation, "fa", to_attr="fallback_translations")
+        ).get(slug="category-0")
+        info = SimpleNamespace(context=graphql_context())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_translation(category, info, "fa", to_attr="fallback_translations").name, "fa-0")
+        self.assertEqual(resolve_translation(category, info, "de", to_attr="fallback_translations").name, "de-0")
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from catalogue.models import Category, CategoryTranslation
+from catalogue.tree import get_category_tree
+
+
+class TestCategoryTree(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        cls.women = Category.add_root(name="Women", slug="women", is_public=False)
+        cls.shoes = cls.men.add_child(name="Shoes", slug="shoes")
+        cls.running = cls.shoes.add_child(name="Running", slug="running")
+        CategoryTranslation.objects.create(category=cls.shoes, language_code="fa", name="کفش")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_snapshot(self):
+        with self.assertNumQueries(1):
+            tree = get_category_tree()
+
+        self.assertEqual([node.slug for node in tree.get_root_nodes()], ["men", "women"])
+        self.assertEqual([node.slug for node in tree.get_root_nodes(browsable=True)], ["men"])
+        self.assertEqual(
+            [node.slug for node in tree.get_ancestors(self.running.pk)], ["men", "shoes"]
+        )
+        self.assertEqual(tree.get_by_full_slug("men/shoes/running").pk, self.running.pk)
+        self.assertEqual(
+            tree.menu(language_code="fa"),
+            [{
+                "id": self.men.pk, "name": "Men", "slug": "men", "full_slug": "men",
+                "children": [{
+                    "id": self.shoes.pk, "name": "کفش", "slug": "shoes", "full_slug": "men/shoes",
+                    "children": [{
+                        "id": self.running.pk, "name": "Running", "slug": "running",
+                        "full_slug": "men/shoes/running", "children": [],
+                    }],
+                }],
+            }],
+        )
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_category_tree(), tree)
+
+    def test_changes_bump_the_version(self):
+        tree = get_category_tree()
+
+        self.shoes.move(self.women, "last-child")
+
+        tree = get_category_tree()
+        self.assertEqual(
+            [node.slug for node in tree.get_children(self.women.pk)], ["shoes"]
+        )
+        self.assertEqual(tree.get(self.running.pk).full_slug, "women/shoes/running")
+
+    def test_uncommitted_changes_are_built_once_and_dropped_on_rollback(self):
+        with transaction.atomic():
+            self.shoes.move(self.women, "last-child")
+            with self.assertNumQueries(1):
+                tree = get_category_tree()
+                self.assertIs(get_category_tree(), tree)
+            self.assertEqual(tree.get(self.running.pk).full_slug, "women/shoes/running")
+            transaction.set_rollback(True)
+
+        tree = get_category_tree()
+        self.assertEqual(tree.get(self.running.pk).full_slug, "men/shoes/running")
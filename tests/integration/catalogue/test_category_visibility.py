@@ -0,0 +1,47 @@
+from django.test import TestCase
+
+from catalogue.models import Category
+
+
+class TestAncestorsArePublic(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        cls.women = Category.add_root(name="Women", slug="women")
+        cls.shoes = cls.men.add_child(name="Shoes", slug="shoes")
+        cls.running = cls.shoes.add_child(name="Running", slug="running")
+        cls.trail = cls.running.add_child(name="Trail", slug="trail")
+        cls.dresses = cls.women.add_child(name="Dresses", slug="dresses")
+
+    def visibility(self):
+        return dict(Category.objects.values_list("slug", "ancestors_are_public"))
+
+    def test_unpublish_and_publish_subtree(self):
+        Category.objects.filter(pk=self.men.pk).update(is_public=False)
+        self.running.refresh_ancestors_are_public()
+        self.assertFalse(self.running.ancestors_are_public)
+
+        self.men.refresh_ancestors_are_public()
+        self.assertEqual(
+            self.visibility(),
+            {"men": True, "shoes": False, "running": False, "trail": False,
+             "women": True, "dresses": True},
+        )
+
+        Category.objects.filter(pk=self.men.pk).update(is_public=True)
+        self.men.refresh_ancestors_are_public()
+        self.assertTrue(all(self.visibility().values()))
+
+    def test_bulk_toggle(self):
+        updated = Category.objects.set_public([self.running, self.women, self.trail], False)
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            self.visibility(),
+            {"men": True, "shoes": True, "running": True, "trail": False,
+             "women": True, "dresses": False},
+        )
+
+        Category.objects.set_public([self.running, self.women], True)
+        self.assertTrue(all(self.visibility().values()))
+        self.assertFalse(Category.objects.get(pk=self.trail.pk).is_public)
@@ -0,0 +1,6 @@
+from strawberry.django.context import StrawberryDjangoContext
+
+
+def graphql_context(request=None) -> StrawberryDjangoContext:
+    """Context the GraphQL views pass to the schema, for running operations with `schema.execute`."""
+    return StrawberryDjangoContext(request=request, response=None)
@@ -0,0 +1,258 @@
+import datetime
+from decimal import Decimal
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils import timezone
+
+from products import models
+from sandbox.schema import dashboard_schema
+
+from ..helpers import graphql_context
+
+FACETS_QUERY = """
+query {
+  products {
+    facets(attributes: ["size", "color"]) { attribute values { value count } }
+  }
+}
+"""
+
+
+class TestFilterByAttribute(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.product_class = models.ProductClass.objects.create(title="Shirt", slug="shirt")
+        cls.size = models.Attribute.objects.create(name="Size", slug="size")
+        cls.color = models.Attribute.objects.create(name="Color", slug="color")
+        cls.values = {
+            (attribute.slug, value): models.AttributeValue.objects.create(
+                attribute=attribute, label=value, value=value
+            )
+            for attribute, value in (
+                (cls.size, "L"),
+                (cls.size, "XL"),
+                (cls.color, "red"),
+                (cls.color, "blue"),
+            )
+        }
+        cls.red_xl = cls.create_product("red-xl", ("size", "XL"), ("color", "red"))
+        cls.blue_xl = cls.create_product("blue-xl", ("size", "XL"), ("color", "blue"))
+        cls.red_l = cls.create_product("red-l", ("size", "L"), ("color", "red"))
+
+    @classmethod
+    def create_product(cls, slug, *values):
+        product = models.Product.objects.create(
+            product_type=cls.product_class, title=slug, slug=slug
+        )
+        product.attribute_values.add(*(cls.values[value] for value in values))
+        return product
+
+    def test_facets_follow_assignments(self):
+        self.assertEqual(models.ProductAttributeFacet.objects.count(), 6)
+        self.red_l.attribute_values.remove(self.values[("color", "red")])
+        self.assertEqual(models.ProductAttributeFacet.objects.count(), 5)
+
+    def test_single_attribute(self):
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(size="XL"),
+            {self.red_xl, self.blue_xl},
+            ordered=False,
+        )
+
+    def test_intersection_without_duplicates(self):
+        products = models.Product.objects.filter_by_attribute(
+            size="XL", color__in=["red", "blue"]
+        )
+        self.assertQuerySetEqual(products, [self.red_xl, self.blue_xl], ordered=False)
+
+    def test_range_lookups(self):
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(size__gte="XL", color__gte="red"),
+            [self.red_xl],
+        )
+
+    def test_unknown_attribute(self):
+        self.assertFalse(models.Product.objects.filter_by_attribute(weight="1").exists())
+
+    def test_facet_counts(self):
+        counts = models.Product.objects.facet_counts(
+            models.Product.objects.filter_by_attribute(color="red"),
+            attributes=["size", "color"],
+        )
+        self.assertEqual(
+            {slug: {row["value"]: row["count"] for row in rows} for slug, rows in counts.items()},
+            {"size": {"L": 1, "XL": 1}, "color": {"red": 2, "blue": 0}},
+        )
+
+    def test_connection_facets(self):
+        result = async_to_sync(dashboard_schema.execute)(
+            FACETS_QUERY, context_value=graphql_context()
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(
+            {
+                facet["attribute"]: {row["value"]: row["count"] for row in facet["values"]}
+                for facet in result.data["products"]["facets"]
+            },
+            {"size": {"L": 1, "XL": 2}, "color": {"red": 2, "blue": 1}},
+        )
+
+    def test_with_attributes_seeds_container(self):
+        with self.assertNumQueries(2):
+            products = list(models.Product.objects.with_attributes().order_by("slug"))
+            self.assertEqual(
+                [product.attr.get("size").value for product in products],
+                ["XL", "L", "XL"],
+            )
+            self.assertIsNone(products[0].attr.get("weight"))
+
+    def test_with_attributes_prefetches_requested_translations(self):
+        red = self.values[("color", "red")]
+        for language_code, label in (("en", "Red"), ("fa", "Ghermez"), ("de", "Rot")):
+            models.AttributeValueTranslation.objects.create(
+                attribute_value=red, language_code=language_code, label=label
+            )
+        models.AttributeTranslation.objects.create(
+            attribute=self.color, language_code="de", name="Farbe"
+        )
+
+        with self.assertNumQueries(4):
+            product = models.Product.objects.with_attributes(language="fa").get(pk=self.red_l.pk)
+            color = product.attr.get("color")
+            self.assertEqual(
+                sorted(row.label for row in color.translations.all()), ["Ghermez", "Red"]
+            )
+            self.assertEqual(list(color.attribute.translations.all()), [])
+
+    def test_numeric_range_uses_typed_column(self):
+        weight = models.Attribute.objects.create(
+            name="Weight", slug="weight", input_type="numeric"
+        )
+        for product, numeric in ((self.red_xl, 2.5), (self.blue_xl, 10)):
+            product.attribute_values.add(
+                models.AttributeValue.objects.create(
+                    attribute=weight, label=str(numeric), numeric=numeric
+                )
+            )
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(weight__gte=3), [self.blue_xl]
+        )
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(weight__lte=3, size="XL"),
+            [self.red_xl],
+        )
+
+    def test_numeric_range_keeps_both_bounds(self):
+        weight = models.Attribute.objects.create(
+            name="Weight", slug="weight", input_type="numeric"
+        )
+        for product, numeric in ((self.red_xl, 1), (self.blue_xl, 4), (self.red_l, 8)):
+            product.attribute_values.add(
+                models.AttributeValue.objects.create(
+                    attribute=weight, label=str(numeric), numeric=numeric
+                )
+            )
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(weight__gte=2, weight__lte=5),
+            [self.blue_xl],
+        )
+
+    def test_numeric_values_are_normalized_to_base_unit(self):
+        length = models.Attribute.objects.create(
+            name="Length", slug="length", input_type="numeric", unit="CM"
+        )
+        value = models.AttributeValue.objects.create(
+            attribute=length, label="150cm", numeric=150
+        )
+        self.red_l.attribute_values.add(value)
+        self.assertAlmostEqual(value.normalized_numeric, 1.5)
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(length__gte=100), [self.red_l]
+        )
+
+        length.unit = "MM"
+        length.save()
+        value.refresh_from_db()
+        self.assertAlmostEqual(value.normalized_numeric, 0.15)
+        self.assertFalse(models.Product.objects.filter_by_attribute(length__gte=200).exists())
+
+    def test_values_are_renormalized_only_when_the_unit_changes(self):
+        length = models.Attribute.objects.create(
+            name="Length", slug="length", input_type="numeric", unit="CM"
+        )
+        value = models.AttributeValue.objects.create(attribute=length, label="150cm", numeric=150)
+        models.AttributeValue.objects.filter(pk=value.pk).update(normalized_numeric=42)
+
+        length.name = "Size"
+        length.save()
+        length.save(update_fields=["name"])
+        value.refresh_from_db()
+        self.assertEqual(value.normalized_numeric, 42)
+
+        length.unit = "M"
+        length.save(update_fields=["unit"])
+        value.refresh_from_db()
+        self.assertEqual(value.normalized_numeric, 150)
+
+    def test_decimal_values_are_converted_to_base_unit(self):
+        length = models.Attribute.objects.create(
+            name="Length", slug="length", input_type="numeric", unit="CM"
+        )
+        self.assertAlmostEqual(length.prepare_filter_value(Decimal("150")), 1.5)
+
+    def test_date_values(self):
+        released = models.Attribute.objects.create(
+            name="Released", slug="released", input_type="date"
+        )
+        self.red_l.attribute_values.add(
+            models.AttributeValue.objects.create(
+                attribute=released,
+                label="2024-05-01",
+                date_time=timezone.make_aware(datetime.datetime(2024, 5, 1)),
+            )
+        )
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(released=datetime.date(2024, 5, 1)),
+            [self.red_l],
+        )
+        self.assertQuerySetEqual(
+            models.Product.objects.filter_by_attribute(released__gte="2024-04-30"),
+            [self.red_l],
+        )
+        self.assertFalse(
+            models.Product.objects.filter_by_attribute(released__gt="2024-05-01").exists()
+        )
+        self.assertEqual(
+            models.AttributeValue.objects.get(attribute=released).typed_value,
+            datetime.date(2024, 5, 1),
+        )
+
+    def test_boolean_values(self):
+        organic = models.Attribute.objects.create(
+            name="Organic", slug="organic", input_type="boolean"
+        )
+        self.blue_xl.attribute_values.add(
+            models.AttributeValue.objects.create(attribute=organic, label="yes", boolean=True)
+        )
+        for value in (True, "true", "1"):
+            self.assertQuerySetEqual(
+                models.Product.objects.filter_by_attribute(organic=value), [self.blue_xl]
+            )
+        self.assertFalse(models.Product.objects.filter_by_attribute(organic="false").exists())
+
+    def test_malformed_values_are_rejected(self):
+        for input_type, value in (
+            ("numeric", "big"),
+            ("numeric", "nan"),
+            ("date", "yesterday"),
+            ("date", "2024-13-45"),
+            ("boolean", "maybe"),
+        ):
+            attribute = models.Attribute(name=input_type, slug=input_type, input_type=input_type)
+            with self.subTest(input_type=input_type, value=value), self.assertRaises(ValidationError):
+                attribute.prepare_filter_value(value)
+
+        attribute = models.Attribute(name="Weight", slug="weight", input_type="numeric")
+        with self.assertRaisesMessage(ValidationError, "'big' is not a valid number for the weight attribute."):
+            attribute.prepare_filter_value("big")
@@ -0,0 +1,134 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from strawberry.relay import to_base64
+
+from catalogue.models import Category
+from products import models
+from sandbox.schema import dashboard_schema
+
+from ..helpers import graphql_context
+
+PRODUCTS_QUERY = """
+query Products($filters: ProductFilterType, $ordering: [ProductOrderType!]) {
+  products(filters: $filters, ordering: $ordering) {
+    edges {
+      node {
+        slug
+        productType { slug }
+        categories { slug }
+        attributes { attribute value }
+      }
+    }
+  }
+}
+"""
+
+
+class TestDashboardProducts(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        cls.shoes = cls.men.add_child(name="Shoes", slug="shoes")
+        cls.women = Category.add_root(name="Women", slug="women")
+
+        cls.cloth = models.ProductClass.objects.create(title="Cloth", slug="cloth", abstract=True)
+        cls.shirt = models.ProductClass.objects.create(title="Shirt", slug="shirt")
+        cls.shoe = models.ProductClass.objects.create(title="Shoe", slug="shoe")
+        models.ProductClassEdge.objects.create(parent=cls.cloth, child=cls.shirt)
+
+        color = models.Attribute.objects.create(name="Color", slug="color")
+        red, blue = (
+            models.AttributeValue.objects.create(attribute=color, label=value, value=value)
+            for value in ("red", "blue")
+        )
+        for slug, product_class, category, value, is_public in (
+            ("sneaker", cls.shoe, cls.shoes, red, True),
+            ("polo", cls.shirt, cls.men, blue, True),
+            ("blouse", cls.shirt, cls.women, red, False),
+        ):
+            product = models.Product.objects.create(
+                product_type=product_class, title=slug, slug=slug, is_public=is_public
+            )
+            product.categories.add(category)
+            product.attribute_values.add(value)
+
+    def slugs(self, filters=None, ordering=None):
+        result = async_to_sync(dashboard_schema.execute)(
+            PRODUCTS_QUERY,
+            variable_values={"filters": filters, "ordering": ordering or [{"title": "ASC"}]},
+            context_value=graphql_context(),
+        )
+        self.assertIsNone(result.errors)
+        return [edge["node"]["slug"] for edge in result.data["products"]["edges"]]
+
+    def test_relations_are_prefetched(self):
+        # page joined with product types, categories, attribute values
+        with self.assertNumQueries(3):
+            result = async_to_sync(dashboard_schema.execute)(
+                PRODUCTS_QUERY, context_value=graphql_context()
+            )
+        self.assertIsNone(result.errors)
+        nodes = {edge["node"]["slug"]: edge["node"] for edge in result.data["products"]["edges"]}
+        self.assertEqual(nodes["polo"]["productType"], {"slug": "shirt"})
+        self.assertEqual(nodes["sneaker"]["categories"], [{"slug": "shoes"}])
+        self.assertEqual(nodes["blouse"]["attributes"], [{"attribute": "color", "value": "red"}])
+
+    def test_category_subtree(self):
+        category = to_base64("CategoryType", self.men.pk)
+        self.assertEqual(self.slugs({"category": category}), ["polo", "sneaker"])
+
+    def test_product_class_includes_descendants(self):
+        self.assertEqual(
+            self.slugs({"productClass": to_base64("ProductClassType", self.cloth.pk)}),
+            ["blouse", "polo"],
+        )
+        self.assertEqual(
+            self.slugs({"productClass": to_base64("ProductClassType", self.shoe.pk)}),
+            ["sneaker"],
+        )
+
+    def test_invalid_category_ids_match_nothing(self):
+        for category in (to_base64("ProductType", self.men.pk), to_base64("CategoryType", "men")):
+            with self.subTest(category=category):
+                self.assertEqual(self.slugs({"category": category}), [])
+        for product_class in (to_base64("CategoryType", self.shoe.pk), to_base64("ProductClassType", "shoe")):
+            with self.subTest(product_class=product_class):
+                self.assertEqual(self.slugs({"productClass": product_class}), [])
+
+    def test_filters_follow_not(self):
+        category = to_base64("CategoryType", self.men.pk)
+        self.assertEqual(self.slugs({"NOT": {"category": category}}), ["blouse"])
+        self.assertEqual(
+            self.slugs({"NOT": {"attributes": [{"attribute": "color", "values": ["red"]}]}}), ["polo"]
+        )
+
+    def test_duplicate_attributes_are_merged(self):
+        attributes = [{"attribute": "color", "values": ["red"]}, {"attribute": "color", "values": ["blue"]}]
+        self.assertEqual(self.slugs({"attributes": attributes}), ["blouse", "polo", "sneaker"])
+
+        result = async_to_sync(dashboard_schema.execute)(
+            PRODUCTS_QUERY,
+            variable_values={"filters": {"attributes": [{"attribute": "color__in", "values": ["red"]}]}},
+            context_value=graphql_context(),
+        )
+        self.assertEqual(result.errors[0].message, "'color__in' is not a valid attribute code.")
+
+    def test_attributes_and_public(self):
+        self.assertEqual(
+            self.slugs({"attributes": [{"attribute": "color", "values": ["red"]}]}),
+            ["blouse", "sneaker"],
+        )
+        self.assertEqual(
+            self.slugs({"isPublic": {"exact": True}, "attributes": [{"attribute": "color", "values": ["red"]}]}),
+            ["sneaker"],
+        )
+
+    def test_updated_at_range_and_ordering(self):
+        polo = models.Product.objects.get(slug="polo")
+        self.assertEqual(
+            self.slugs(
+                {"updatedAt": {"range": {"start": polo.updated_at.isoformat(), "end": polo.updated_at.isoformat()}}}
+            ),
+            ["polo"],
+        )
+        self.assertEqual(self.slugs(ordering=[{"title": "DESC"}]), ["sneaker", "polo", "blouse"])
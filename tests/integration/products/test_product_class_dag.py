@@ -0,0 +1,149 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from products import models
+from products.graph import ProductClassGraph
+
+
+class TestProductClassClosure(TestCase):
+    """
+        base
+       /    \\
+    cloth  gift
+       \\    /
+       shirt
+         |
+       polo
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.classes = {
+            slug: models.ProductClass.objects.create(title=slug, slug=slug)
+            for slug in ("base", "cloth", "gift", "shirt", "polo")
+        }
+        for parent, child in (
+            ("base", "cloth"),
+            ("base", "gift"),
+            ("cloth", "shirt"),
+            ("gift", "shirt"),
+            ("shirt", "polo"),
+        ):
+            cls.link(parent, child)
+
+    @classmethod
+    def link(cls, parent, child):
+        return models.ProductClassEdge.objects.create(
+            parent=cls.classes[parent], child=cls.classes[child]
+        )
+
+    def slugs(self, queryset):
+        return [product_class.slug for product_class in queryset]
+
+    def test_ancestors_nearest_first(self):
+        polo = self.classes["polo"]
+        self.assertEqual(self.slugs(polo.get_ancestors()), ["shirt", "cloth", "gift", "base"])
+        self.assertEqual(
+            models.ProductClass.objects.get_ancestor_ids(polo.pk)[-1],
+            {"parent_id": self.classes["base"].pk, "depth": 3},
+        )
+
+    def test_descendants_include_self(self):
+        self.assertEqual(
+            self.slugs(self.classes["gift"].get_descendants(include_self=True)),
+            ["gift", "shirt", "polo"],
+        )
+
+    def test_check_cycle(self):
+        with self.assertRaises(ValidationError):
+            models.ProductClassEdge.validate_edge(
+                parent_id=self.classes["polo"].pk, child_id=self.classes["base"].pk
+            )
+        self.assertFalse(
+            models.ProductClass.objects.check_cycle(
+                self.classes["gift"].pk, self.classes["cloth"].pk
+            )
+        )
+
+    def test_unlink_keeps_alternative_paths(self):
+        models.ProductClassEdge.objects.get(
+            parent=self.classes["cloth"], child=self.classes["shirt"]
+        ).delete()
+        self.assertEqual(
+            self.slugs(self.classes["polo"].get_ancestors()), ["shirt", "gift", "base"]
+        )
+
+    def test_delete_class(self):
+        self.classes["shirt"].delete()
+        self.assertEqual(self.slugs(self.classes["polo"].get_ancestors()), [])
+        self.assertEqual(
+            self.slugs(self.classes["base"].get_descendants()), ["cloth", "gift"]
+        )
+
+    def test_rebuild_is_consistent(self):
+        rows = set(models.ProductClassClosure.objects.values_list("ancestor", "descendant", "depth"))
+        models.ProductClassClosure.objects.rebuild()
+        self.assertEqual(
+            set(models.ProductClassClosure.objects.values_list("ancestor", "descendant", "depth")),
+            rows,
+        )
+
+    def test_effective_attributes(self):
+        def assign(slug, attribute, sort_order=None):
+            return models.Attribute.product_class.through.objects.create(
+                product_class=self.classes[slug], attribute=attribute, sort_order=sort_order
+            )
+
+        brand = models.Attribute.objects.create(name="Brand", slug="brand")
+        size = models.Attribute.objects.create(name="Size", slug="size")
+        wrap = models.Attribute.objects.create(name="Wrap", slug="wrap")
+        assign("base", brand)
+        assign("shirt", size)
+        assign("gift", wrap)
+        assign("gift", brand)
+
+        polo = self.classes["polo"]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [attribute.slug for attribute in polo.get_attributes()],
+                ["size", "wrap", "brand"],
+            )
+
+        models.ProductClassEdge.objects.get(
+            parent=self.classes["gift"], child=self.classes["shirt"]
+        ).delete()
+        self.assertEqual(
+            [attribute.slug for attribute in polo.get_attributes()], ["size", "brand"]
+        )
+
+    def test_bulk_link(self):
+        extra = models.ProductClass.objects.create(title="extra", slug="extra")
+        self.classes["extra"] = extra
+        edges = models.ProductClassEdge.objects.bulk_link(
+            [(self.classes["polo"], extra), (self.classes["shirt"].pk, self.classes["polo"].pk)]
+        )
+        self.assertEqual(len(edges), 1)
+        self.assertEqual(
+            self.slugs(extra.get_ancestors()), ["polo", "shirt", "cloth", "gift", "base"]
+        )
+
+    def test_bulk_link_rejects_cycles(self):
+        with self.assertRaisesMessage(ValidationError, "base -> cloth -> shirt -> polo -> base"):
+            models.ProductClassEdge.objects.bulk_link(
+                [(self.classes["polo"], self.classes["base"])]
+            )
+        self.assertEqual(self.classes["polo"].get_descendants(), [])
+
+
+class TestProductClassGraph(SimpleTestCase):
+    def test_snapshot(self):
+        classes = [models.ProductClass(pk=pk, slug=f"class-{pk}") for pk in range(1, 6)]
+        graph = ProductClassGraph(classes, [(1, 2), (1, 3), (2, 4), (3, 4), (4, 5)])
+
+        self.assertEqual(graph.order.index(1), 0)
+        self.assertEqual(graph.ancestors[5], {4: 1, 2: 2, 3: 2, 1: 3})
+        self.assertEqual(
+            [product_class.pk for product_class in graph.get_descendants(2, include_self=True)],
+            [2, 4, 5],
+        )
+        self.assertIsNot(graph.get_ancestors(5)[0], graph.classes[4])
@@ -0,0 +1,51 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from catalogue.models import Category
+from sandbox.schema import dashboard_schema
+from utils.relay import CursorConnection
+
+from .helpers import graphql_context
+
+QUERY = """
+query Categories($filters: CategoryFilterType) {
+  categories(filters: $filters) { totalCount totalCountIsExact }
+}
+"""
+
+
+class TestApproximateTotalCount(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(5):
+            Category.add_root(name=f"category {index}", slug=f"category-{index}")
+
+    def count(self, **variables):
+        result = async_to_sync(dashboard_schema.execute)(
+            QUERY, variable_values=variables, context_value=graphql_context()
+        )
+        self.assertIsNone(result.errors)
+        return result.data["categories"]
+
+    def test_exact_mode(self):
+        self.assertEqual(self.count(), {"totalCount": 5, "totalCountIsExact": True})
+
+    @mock.patch.multiple(CursorConnection, TOTAL_COUNT_MODE="approximate", TOTAL_COUNT_THRESHOLD=3)
+    def test_bounded_count(self):
+        self.assertEqual(self.count(), {"totalCount": 3, "totalCountIsExact": False})
+        self.assertEqual(
+            self.count(filters={"slug": {"inList": ["category-1", "category-2"]}}),
+            {"totalCount": 2, "totalCountIsExact": True},
+        )
+
+    @mock.patch.multiple(CursorConnection, TOTAL_COUNT_MODE="approximate", TOTAL_COUNT_THRESHOLD=3)
+    def test_planner_estimate(self):
+        with mock.patch("utils.relay.estimate_count", return_value=1000) as estimate:
+            self.assertEqual(self.count(), {"totalCount": 1000, "totalCountIsExact": False})
+            self.assertEqual(
+                self.count(filters={"slug": {"exact": "category-1"}}),
+                {"totalCount": 1, "totalCountIsExact": True},
+            )
+        estimate.assert_called_once()
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from sandbox.schema import public_schema
+from utils import persisted_queries
+from utils.persisted_queries import query_hash
+
+QUERY = "query Hello { __typename }"
+
+
+class TestPersistedQueries(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        persisted_queries.documents.clear()
+
+    def execute(self, query=None, sha256=None):
+        return public_schema.execute_sync(
+            query,
+            operation_extensions={"persistedQuery": {"version": 1, "sha256Hash": sha256}},
+        )
+
+    def test_register_on_first_use(self):
+        result = self.execute(sha256=query_hash(QUERY))
+        self.assertEqual(result.errors[0].message, "PersistedQueryNotFound")
+
+        result = self.execute(QUERY, sha256=query_hash(QUERY))
+        self.assertEqual(result.data, {"__typename": "Query"})
+
+        with mock.patch("strawberry.schema.schema.parse") as parse, mock.patch(
+            "strawberry.schema.schema.validate_document", return_value=[]
+        ) as validate:
+            result = self.execute(sha256=query_hash(QUERY))
+        self.assertEqual(result.data, {"__typename": "Query"})
+        parse.assert_not_called()
+        # only the rules checking the variables of the request run again
+        _, _, rules = validate.call_args.args
+        self.assertTrue(rules)
+        self.assertTrue(all(rule.validates_variables for rule in rules))
+
+    def test_shared_cache_serves_other_processes(self):
+        self.execute(QUERY, sha256=query_hash(QUERY))
+        persisted_queries.documents.clear()
+
+        result = self.execute(sha256=query_hash(QUERY))
+        self.assertEqual(result.data, {"__typename": "Query"})
+
+    def test_hash_mismatch(self):
+        result = self.execute(QUERY, sha256="0" * 64)
+        self.assertEqual(result.errors[0].message, "provided sha does not match query")
+
+    def test_invalid_query_is_not_registered(self):
+        query = "{ missing }"
+        result = self.execute(query, sha256=query_hash(query))
+        self.assertTrue(result.errors)
+        self.assertIsNone(cache.get(persisted_queries.QUERY_CACHE_KEY % query_hash(query)))
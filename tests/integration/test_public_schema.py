@@ -0,0 +1,157 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase
+
+from catalogue.models import Category
+from catalogue.tree import get_category_tree
+from products.models import Attribute, AttributeValue, Product, ProductClass
+from sandbox.schema import public_schema
+
+from .helpers import graphql_context
+
+PRODUCTS_QUERY = """
+query Products($category: String, $attributes: [AttributeFilterInput!]) {
+  products(category: $category, attributes: $attributes) {
+    edges {
+      node {
+        slug
+        categories { fullSlug }
+        attributes { attribute value }
+        translation { title }
+      }
+    }
+  }
+}
+"""
+
+CATEGORY_QUERY = """
+query Category($fullSlug: String!) {
+  category(fullSlug: $fullSlug) {
+    name
+    productCount
+    children { fullSlug }
+    ancestors { fullSlug }
+  }
+}
+"""
+
+
+class TestPublicSchema(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        cls.shoes = cls.men.add_child(name="Shoes", slug="shoes")
+        cls.hidden = cls.men.add_child(name="Hidden", slug="hidden", is_public=False)
+        cls.sale = cls.hidden.add_child(name="Sale", slug="sale")
+        cls.sale.refresh_ancestors_are_public()
+
+        product_class = ProductClass.objects.create(title="Shoe", slug="shoe")
+        color = Attribute.objects.create(name="Color", slug="color")
+        red, blue = (
+            AttributeValue.objects.create(attribute=color, label=value, value=value)
+            for value in ("red", "blue")
+        )
+        cls.products = {}
+        for slug, value, is_public in (("sneaker", red, True), ("boot", blue, True), ("draft", red, False)):
+            product = Product.objects.create(
+                product_type=product_class, title=slug, slug=slug, is_public=is_public
+            )
+            product.categories.add(cls.shoes, cls.sale)
+            product.attribute_values.add(value)
+            cls.products[slug] = product
+
+    def setUp(self):
+        cache.clear()
+
+    def execute(self, query, **variables):
+        result = async_to_sync(public_schema.execute)(
+            query, variable_values=variables, context_value=graphql_context()
+        )
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def test_menu_hides_hidden_branches(self):
+        menu = self.execute("{ categoryMenu { fullSlug children { fullSlug } } }")["categoryMenu"]
+        self.assertEqual(menu, [{"fullSlug": "men", "children": [{"fullSlug": "men/shoes"}]}])
+
+    def test_category(self):
+        category = self.execute(CATEGORY_QUERY, fullSlug="men")["category"]
+        self.assertEqual(
+            category,
+            {"name": "Men", "productCount": 2, "children": [{"fullSlug": "men/shoes"}], "ancestors": []},
+        )
+        self.assertIsNone(self.execute(CATEGORY_QUERY, fullSlug="men/hidden/sale")["category"])
+
+    def test_products_are_public_and_filtered(self):
+        get_category_tree()
+        # page, categories, attribute values, translations: the tree snapshot is in memory
+        with self.assertNumQueries(4):
+            edges = self.execute(PRODUCTS_QUERY, category="men")["products"]["edges"]
+        self.assertCountEqual([edge["node"]["slug"] for edge in edges], ["sneaker", "boot"])
+        self.assertEqual(edges[0]["node"]["categories"], [{"fullSlug": "men/shoes"}])
+
+        edges = self.execute(
+            PRODUCTS_QUERY, attributes=[{"attribute": "color", "values": ["red"]}]
+        )["products"]["edges"]
+        self.assertEqual([edge["node"]["slug"] for edge in edges], ["sneaker"])
+
+        edges = self.execute(PRODUCTS_QUERY, category="men/hidden")["products"]["edges"]
+        self.assertEqual(edges, [])
+
+    def test_attribute_filters_are_merged_and_checked(self):
+        attributes = [{"attribute": "color", "values": ["red"]}, {"attribute": "color", "values": ["blue"]}]
+        edges = self.execute(PRODUCTS_QUERY, attributes=attributes)["products"]["edges"]
+        self.assertCountEqual([edge["node"]["slug"] for edge in edges], ["sneaker", "boot"])
+
+        result = async_to_sync(public_schema.execute)(
+            PRODUCTS_QUERY,
+            variable_values={"attributes": [{"attribute": "color__in", "values": ["red"]}]},
+            context_value=graphql_context(),
+        )
+        self.assertIn("'color__in' is not a valid attribute code.", result.errors[0].message)
+
+    def test_cached_menu_follows_the_tree(self):
+        query = "{ categoryMenu { name } }"
+        self.assertEqual(self.execute(query)["categoryMenu"], [{"name": "Men"}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.men.name = "Gentlemen"
+            self.men.save()
+        self.assertEqual(self.execute(query)["categoryMenu"], [{"name": "Gentlemen"}])
+
+    def test_product_by_slug(self):
+        query = "query Product($slug: String!) { product(slug: $slug) { title } }"
+        self.assertEqual(self.execute(query, slug="boot")["product"], {"title": "boot"})
+        self.assertIsNone(self.execute(query, slug="draft")["product"])
+
+    def test_typed_attribute_values(self):
+        weight = Attribute.objects.create(name="Weight", slug="weight", input_type="numeric", unit="KG")
+        organic = Attribute.objects.create(name="Organic", slug="organic", input_type="boolean")
+        self.products["boot"].attribute_values.add(
+            AttributeValue.objects.create(attribute=weight, label="1.5 kg", numeric=1.5),
+            AttributeValue.objects.create(attribute=organic, label="Organic", boolean=False),
+        )
+        query = """
+        query Product($slug: String!) {
+          product(slug: $slug) { attributes { attribute inputType value numeric boolean } }
+        }
+        """
+
+        attributes = self.execute(query, slug="boot")["product"]["attributes"]
+
+        self.assertCountEqual(
+            attributes,
+            [
+                {"attribute": "color", "inputType": "dropdown", "value": "blue", "numeric": None, "boolean": None},
+                {"attribute": "weight", "inputType": "numeric", "value": "1.5", "numeric": 1.5, "boolean": None},
+                {"attribute": "organic", "inputType": "boolean", "value": "false", "numeric": None, "boolean": False},
+            ],
+        )
+
+    def test_cache_hints_cap_the_response_timeout(self):
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            self.execute(CATEGORY_QUERY, fullSlug="men")
+        timeouts = [call.kwargs.get("timeout") for call in cache_set.call_args_list]
+        self.assertIn(60, timeouts)
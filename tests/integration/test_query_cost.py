@@ -0,0 +1,86 @@
+import strawberry
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from graphql import get_introspection_query
+
+from sandbox.schema import dashboard_schema, public_schema
+from utils.query_cost import QueryCost, cost_hint
+
+from .helpers import graphql_context
+
+QUERY = """
+query Categories($first: Int) {
+  categories(first: $first) {
+    edges { node { name children { name } } }
+  }
+}
+"""
+
+
+@strawberry.type
+class Report:
+    total: int = strawberry.field(default=0, metadata=cost_hint(20))
+    pages: list["Report"] = strawberry.field(default_factory=list, metadata=cost_hint(5))
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def report(self) -> Report:
+        return Report()
+
+
+weighted_schema = strawberry.Schema(Query, extensions=[QueryCost])
+
+
+class TestQueryCost(TestCase):
+    def execute(self, first):
+        return async_to_sync(dashboard_schema.execute)(
+            QUERY, variable_values={"first": first}, context_value=graphql_context()
+        )
+
+    def test_cost_is_reported(self):
+        result = self.execute(first=5)
+
+        self.assertIsNone(result.errors)
+        # categories: 1 + 5 * (edges: 1 + node: 1 + children: 1)
+        self.assertEqual(result.extensions["cost"], {"requested": 16, "maximum": 5000})
+
+    def test_page_size_is_clamped(self):
+        # categories caps its page at 20 results
+        result = self.execute(first=1000)
+        self.assertEqual(result.extensions["cost"]["requested"], 1 + 20 * 3)
+
+        result = self.execute(first=-5)
+        self.assertEqual(result.extensions["cost"]["requested"], 1)
+
+    @override_settings(GRAPHQL_MAX_QUERY_COST=50)
+    def test_expensive_operation_is_rejected(self):
+        with self.assertNumQueries(0):
+            result = self.execute(first=20)
+
+        self.assertIsNone(result.data)
+        self.assertEqual(
+            result.errors[0].message, "Query cost 61 exceeds the maximum cost of 50."
+        )
+        self.assertEqual(result.errors[0].extensions, {"code": "QUERY_TOO_EXPENSIVE"})
+
+    @override_settings(GRAPHQL_MAX_QUERY_COST=10)
+    def test_introspection_has_a_flat_cost(self):
+        for schema in (dashboard_schema, public_schema):
+            with self.subTest(schema=schema):
+                result = async_to_sync(schema.execute)(
+                    get_introspection_query(descriptions=True), context_value=graphql_context()
+                )
+
+                self.assertIsNone(result.errors)
+                self.assertEqual(result.extensions["cost"]["requested"], 1)
+
+    def test_fields_are_priced_by_their_weight(self):
+        result = weighted_schema.execute_sync(
+            "{ report { total pages { total } } }", context_value=graphql_context()
+        )
+
+        self.assertIsNone(result.errors)
+        # report: 1 + total: 20 + pages: 5 + 10 * total: 20
+        self.assertEqual(result.extensions["cost"]["requested"], 226)
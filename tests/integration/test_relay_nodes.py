@@ -0,0 +1,58 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from strawberry.relay import to_base64
+
+from catalogue.models import Category
+from products.models import Product, ProductClass
+from sandbox.schema import dashboard_schema
+
+from .helpers import graphql_context
+
+QUERY = """
+query Nodes($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    id
+    ... on CategoryType { name }
+    ... on ProductType { title }
+  }
+}
+"""
+
+
+class TestRelayNodes(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        product_class = ProductClass.objects.create(title="Shoe", slug="shoe")
+        cls.categories = [
+            Category.add_root(name=f"category {index}", slug=f"category-{index}")
+            for index in range(20)
+        ]
+        cls.products = [
+            Product.objects.create(product_type=product_class, title=f"product {index}", slug=f"product-{index}")
+            for index in range(20)
+        ]
+
+    def execute(self, ids):
+        result = async_to_sync(dashboard_schema.execute)(
+            QUERY, variable_values={"ids": ids}, context_value=graphql_context()
+        )
+        self.assertIsNone(result.errors)
+        return result.data["nodes"]
+
+    def test_one_query_per_type_in_requested_order(self):
+        ids = [
+            to_base64(type_name, instance.pk)
+            for category, product in zip(self.categories, reversed(self.products))
+            for type_name, instance in (("ProductType", product), ("CategoryType", category))
+        ]
+
+        with self.assertNumQueries(2):
+            nodes = self.execute(ids)
+
+        self.assertEqual([node["id"] for node in nodes], ids)
+        self.assertEqual(nodes[0]["title"], "product 19")
+        self.assertEqual(nodes[1]["name"], "category 0")
+
+    def test_missing_nodes_are_null(self):
+        ids = [to_base64("CategoryType", self.categories[0].pk), to_base64("CategoryType", 0)]
+        self.assertEqual(self.execute(ids), [{"id": ids[0], "name": "category 0"}, None])
@@ -0,0 +1,130 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from strawberry.relay import to_base64
+from strawberry_django.optimizer import DjangoOptimizerExtension
+
+from account.models import User
+from catalogue.models import Category, CategoryTranslation
+from sandbox.schema import dashboard_schema
+from utils.response_cache import RESPONSE_CACHE_KEY, TAG_CACHE_KEY, ResponseCache, model_tag
+
+from .helpers import graphql_context
+
+LIST_QUERY = "{ categories { edges { node { name } } } }"
+NODE_QUERY = "query Node($id: ID!) { node(id: $id) { ... on CategoryType { name } } }"
+
+
+class TestResponseCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        cls.women = Category.add_root(name="Women", slug="women")
+
+    def setUp(self):
+        cache.clear()
+        # only the dashboard schema has the relay `node` field, cache it instead
+        patcher = mock.patch.object(
+            dashboard_schema, "extensions", [ResponseCache, DjangoOptimizerExtension]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def execute(self, query, **variables):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = async_to_sync(dashboard_schema.execute)(
+                query, variable_values=variables, context_value=graphql_context()
+            )
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def node(self, category):
+        return self.execute(NODE_QUERY, id=to_base64("CategoryType", category.pk))["node"]["name"]
+
+    def test_hits_skip_the_database(self):
+        data = self.execute(LIST_QUERY)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.execute(LIST_QUERY), data)
+
+    def test_invalidation_by_tags(self):
+        self.execute(LIST_QUERY)
+        self.assertEqual(self.node(self.men), "Men")
+        self.assertEqual(self.node(self.women), "Women")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.women.name = "Ladies"
+            self.women.save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.node(self.men), "Men")
+        self.assertEqual(self.node(self.women), "Ladies")
+        names = [edge["node"]["name"] for edge in self.execute(LIST_QUERY)["categories"]["edges"]]
+        self.assertEqual(names, ["Men", "Ladies"])
+
+
+    def test_changes_during_execution_expire_the_result(self):
+        self.execute(LIST_QUERY)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.women.save()
+
+        resolve = ResponseCache.resolve
+
+        def resolve_while_committing(extension, *args, **kwargs):
+            cache.set(TAG_CACHE_KEY % model_tag(Category), "committed meanwhile", timeout=None)
+            return resolve(extension, *args, **kwargs)
+
+        with mock.patch.object(ResponseCache, "resolve", resolve_while_committing):
+            self.execute(LIST_QUERY)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.execute(LIST_QUERY)
+        self.assertTrue(queries.captured_queries)
+
+
+MENU_QUERY = "{ categoryMenu { name } }"
+
+
+class TestResponseCacheView(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.men = Category.add_root(name="Men", slug="men")
+        CategoryTranslation.objects.create(category=cls.men, language_code="fa", name="مردانه")
+        cls.user = User.objects.create_user(email="user@example.com", password="secret")
+
+    def setUp(self):
+        cache.clear()
+
+    async def menu(self, language=None):
+        response = await self.async_client.post(
+            "/graphql/",
+            {"query": MENU_QUERY},
+            content_type="application/json",
+            headers={"Accept-Language": language} if language else None,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("errors", response.json())
+        return response.json()["data"]["categoryMenu"]
+
+    def stored_responses(self, cache_set):
+        prefix = RESPONSE_CACHE_KEY % ""
+        return [call for call in cache_set.call_args_list if call.args[0].startswith(prefix)]
+
+    async def test_logged_in_users_are_not_cached(self):
+        await self.async_client.aforce_login(self.user)
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            self.assertEqual(await self.menu(), [{"name": "Men"}])
+        self.assertEqual(self.stored_responses(cache_set), [])
+
+        await self.async_client.alogout()
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            await self.menu()
+        self.assertEqual(len(self.stored_responses(cache_set)), 1)
+
+    async def test_key_follows_the_accept_language_header(self):
+        self.assertEqual(await self.menu(language="fa"), [{"name": "مردانه"}])
+        self.assertEqual(await self.menu(language="en"), [{"name": "Men"}])
+        self.assertEqual(await self.menu(language="fa"), [{"name": "مردانه"}])
@@ -0,0 +1,98 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from account.models import User
+from catalogue.models import Category
+from sandbox.schema import dashboard_schema
+from utils.tracing import TRACE_HEADER, OperationStats, OperationTracing, operation_stats
+
+from .helpers import graphql_context
+
+QUERY = "query Tree { categories { edges { node { name children { name } } } } }"
+
+
+class TestOperationTracing(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(3):
+            Category.add_root(name=f"category {index}", slug=f"category-{index}")
+
+    def setUp(self):
+        operation_stats.reset()
+
+    def execute(self, operation_name=None, **headers):
+        request = RequestFactory().post("/dashboard/graphql/", headers=headers)
+        return async_to_sync(dashboard_schema.execute)(
+            QUERY, operation_name=operation_name, context_value=graphql_context(request)
+        )
+
+    @override_settings(DEBUG=True)
+    def test_trace_in_response_extensions(self):
+        result = self.execute(**{TRACE_HEADER: "1"})
+        self.assertIsNone(result.errors)
+        tracing = result.extensions["tracing"]
+
+        self.assertEqual(set(tracing["phases"]), {"parse", "validate", "execute"})
+        self.assertEqual(tracing["sql"]["count"], 2)
+        durations = [resolver["duration"] for resolver in tracing["resolvers"]]
+        self.assertEqual(len(durations), 10)
+        self.assertEqual(durations, sorted(durations, reverse=True))
+        self.assertTrue(tracing["resolvers"][0]["path"].startswith("categories"))
+
+        self.assertNotIn("tracing", self.execute().extensions)
+
+    def test_resolvers_are_timed_for_traced_operations_only(self):
+        with mock.patch.object(OperationTracing, "_record_resolver") as record_resolver:
+            result = self.execute(**{TRACE_HEADER: "1"})
+
+        self.assertIsNone(result.errors)
+        self.assertNotIn("tracing", result.extensions)
+        record_resolver.assert_not_called()
+
+    def test_histogram_is_scraped_by_staff(self):
+        self.assertIsNone(self.execute().errors)
+        self.assertEqual(operation_stats.snapshot()["Tree"]["sql_count"], 2)
+
+        user = User.objects.create_superuser(email="staff@example.com", password="secret")
+        self.client.force_login(user)
+        response = self.client.get(reverse("graphql-metrics"))
+        self.assertContains(response, 'graphql_operation_duration_seconds_count{operation="Tree"} 1')
+        self.assertContains(response, 'graphql_operation_sql_queries_total{operation="Tree"} 2')
+
+    async def test_trace_is_returned_to_logged_in_staff(self):
+        staff = await sync_to_async(User.objects.create_superuser)(email="staff@example.com", password="secret")
+        customer = await sync_to_async(User.objects.create_user)(email="customer@example.com", password="secret")
+
+        for user, traced in ((staff, True), (customer, False)):
+            await self.async_client.aforce_login(user)
+            response = await self.async_client.post(
+                "/dashboard/graphql/",
+                {"query": QUERY},
+                content_type="application/json",
+                headers={TRACE_HEADER: "1"},
+            )
+            body = response.json()
+            self.assertNotIn("errors", body)
+            self.assertEqual("tracing" in body.get("extensions", {}), traced)
+
+    def test_operations_are_named_after_their_definition(self):
+        response = self.client.post(
+            "/dashboard/graphql/",
+            {"query": QUERY, "operationName": 'Tree"} 1\nforged'},
+            content_type="application/json",
+        )
+        self.assertNotEqual(response.status_code, 200)
+
+        self.assertEqual(set(operation_stats.snapshot()), {"anonymous"})
+
+    def test_operation_names_are_capped_and_escaped(self):
+        stats = OperationStats(max_operations=2)
+        for name in ('Say"hi"\\\n', "Tree", "Other1", "Other2"):
+            stats.observe(name, 0.1, 1, 0.01)
+
+        self.assertEqual(set(stats.snapshot()), {'Say"hi"\\\n', "Tree", "other"})
+        self.assertEqual(stats.snapshot()["other"]["count"], 2)
+        self.assertIn('graphql_operation_duration_seconds_count{operation="Say\\"hi\\"\\\\\\n"} 1', stats.render())